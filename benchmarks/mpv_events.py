@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# mpv_events.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Measure mpv events per second per player, main loop vs event threads.
+
+Usage: mpv_events.py [--pkgdatadir DIR] [--players N] [--seconds S]
+
+Each player decodes a generated video as fast as possible with the same
+property observers as a Cine window. Observers hop to the main loop with
+idle_add in thread mode, like before, and run directly in glib mode.
+"""
+
+import sys
+import time
+import argparse
+import threading
+
+import gi
+import mpv
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+SOURCE = "av://lavfi:testsrc2=size=320x240:rate=1000"
+OBSERVED = (
+    "time-pos",
+    "pause",
+    "duration",
+    "volume",
+    "mute",
+    "playlist-pos",
+    "playlist-count",
+    "track-list",
+    "chapter-list",
+    "media-title",
+    "idle-active",
+)
+
+
+def run(mode, players, seconds, event_source):
+    loop = GLib.MainLoop()
+    handled = [0] * players
+    instances = []
+    sources = []
+
+    def on_main(i):
+        handled[i] += 1
+        return False
+
+    for i in range(players):
+        player = mpv.MPV(
+            start_event_thread=mode == "thread",
+            vo="null",
+            ao="null",
+            untimed=True,
+            loop_file="inf",
+        )
+        for name in OBSERVED:
+            if mode == "thread":
+                observer = lambda _n, _v, i=i: GLib.idle_add(on_main, i)
+            else:
+                observer = lambda _n, _v, i=i: on_main(i)
+            player.observe_property(name, observer)
+
+        if mode == "glib":
+            sources.append(event_source(player))
+        instances.append(player)
+
+    for player in instances:
+        player.play(SOURCE)
+
+    threads = threading.active_count()
+    GLib.timeout_add(int(seconds * 1000), loop.quit)
+    start = time.monotonic()
+    loop.run()
+    elapsed = time.monotonic() - start
+
+    for player, source in zip(instances, sources or [None] * players):
+        if source:
+            source.destroy()
+        player.terminate()
+
+    rates = [n / elapsed for n in handled]
+    busy = sum(s.busy_us for s in sources) / 1000
+    print(
+        f"{mode}: {sum(rates) / players:.0f} events/s per player, "
+        f"min {min(rates):.0f}, python threads {threads}"
+        + (f", drain time {busy:.0f} ms" if sources else "")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pkgdatadir", default="/app/share/cine")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    sys.path.insert(1, args.pkgdatadir)
+    from cine.events import MpvEventSource
+
+    for mode in ("thread", "glib"):
+        run(mode, args.players, args.seconds, MpvEventSource)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
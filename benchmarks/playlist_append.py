@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# playlist_append.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Time appending files to a large playlist, as seen by the playlist model.
+
+Usage: playlist_append.py [--pkgdatadir DIR] [--size N] [--append N] [--runs N]
+
+Fills mpv's playlist with SIZE entries, then appends APPEND more and applies
+the new playlist-count to PlaylistModel. Fails if a run touches more rows
+than appended.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+import mpv
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pkgdatadir", default="/app/share/cine")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--append", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    sys.path.insert(1, args.pkgdatadir)
+    from cine.playlistmodel import PlaylistModel
+
+    player = mpv.MPV(vo="null", ao="null", idle=True)
+    with tempfile.NamedTemporaryFile("w", suffix=".m3u", delete=False) as f:
+        f.writelines(f"/media/video-{i:06}.mkv\n" for i in range(args.size))
+    player.command("loadlist", f.name, "replace")
+    os.unlink(f.name)
+
+    model = PlaylistModel(player)
+    touched = []
+    model.connect("items-changed", lambda _m, _p, r, a: touched.append(r + a))
+    model.update(player.playlist_count)
+
+    times, rows = [], []
+    for run in range(args.runs):
+        for i in range(args.append):
+            player.loadfile(f"/media/added-{run}-{i}.mkv", "append")
+
+        touched.clear()
+        start = time.monotonic()
+        model.update(player.playlist_count)
+        times.append((time.monotonic() - start) * 1000)
+        rows.append(sum(touched))
+
+    player.terminate()
+
+    print(f"playlist size: {model.get_n_items()}")
+    print(f"apply count: median {statistics.median(times):.2f} ms")
+    print(f"rows touched per append: max {max(rows)} (appended {args.append})")
+
+    return 1 if max(rows) > args.append else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# startup.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Time launches that forward files to an already running Cine.
+
+Usage: startup.py [--cine PATH] [--runs N] [--limit MS] FILE
+
+Starts a primary instance, then runs `cine FILE` repeatedly while it is up.
+Fails if the median remote launch is above the limit or if the remote
+process imported the window or mpv modules.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("file")
+    parser.add_argument("--cine", default="cine")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--limit", type=float, default=100, help="milliseconds")
+    args = parser.parse_args()
+
+    env = dict(os.environ, CINE_PROFILE="1", PYTHONUNBUFFERED="1")
+    primary = subprocess.Popen(
+        [args.cine, "--new-window"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+
+    try:
+        # Wait for the primary instance to show its window
+        for line in primary.stdout:  # type: ignore
+            if "Launch to present" in line:
+                break
+
+        times = []
+        heavy_loaded = set()
+
+        for _ in range(args.runs):
+            start = time.monotonic()
+            out = subprocess.run(
+                [args.cine, args.file], env=env, capture_output=True, text=True
+            ).stdout
+            times.append((time.monotonic() - start) * 1000)
+
+            for line in out.splitlines():
+                if "Heavy modules loaded:" in line:
+                    loaded = line.split(":", 1)[1].strip()
+                    if loaded != "none":
+                        heavy_loaded.update(loaded.split(", "))
+    finally:
+        primary.terminate()
+        primary.wait()
+
+    median = statistics.median(times)
+    print(f"remote launch: median {median:.1f} ms, max {max(times):.1f} ms")
+    print(f"heavy modules: {', '.join(sorted(heavy_loaded)) or 'none'}")
+
+    if heavy_loaded or median > args.limit:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
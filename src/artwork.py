@@ -0,0 +1,155 @@
+# artwork.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import hashlib
+import threading
+
+gi.require_version("Gio", "2.0")
+gi.require_version("GLib", "2.0")
+from gi.repository import Gio, GLib
+
+ARTWORK_DIR = os.path.join(GLib.get_user_cache_dir(), "cine", "artwork")
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+ART_SIZE = 512
+EXTRACT_TIMEOUT = 15
+
+
+class ArtworkCache:
+    """Cover art and video frames as JPEG files, keyed by path, size and mtime.
+
+    Images are written once by ffmpeg in a subprocess and renamed into place.
+    The directory is kept under MAX_CACHE_BYTES by removing the least
+    recently used files, in a worker thread.
+    """
+
+    def __init__(self, directory=ARTWORK_DIR):
+        self._dir = directory
+        self._evicting = False
+
+    def _file(self, path):
+        if not path or "://" in path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        key = f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}"
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._dir, f"{name}.jpg")
+
+    def lookup(self, path):
+        """Return the URI of the cached image for path, or None."""
+        file = self._file(path)
+        if not file:
+            return None
+        try:
+            # The mtime is the last use, for eviction
+            os.utime(file)
+        except OSError:
+            return None
+        return GLib.filename_to_uri(file)
+
+    def extract(self, path, ff_index, start, cancellable, callback):
+        """Write the image for path in the background, then callback(uri).
+
+        ff_index is the ffmpeg stream of an attached picture. Without one,
+        ffmpeg's thumbnail filter picks a frame from around start seconds.
+        """
+        file = self._file(path)
+        if not file:
+            return
+
+        tmp = f"{file}.{os.getpid()}.tmp"
+        scale = f"scale='min({ART_SIZE},iw)':-2"
+        cmd = ["ffmpeg", "-nostdin", "-v", "error", "-threads", "1"]
+        if ff_index is None:
+            cmd += ["-ss", f"{start:.3f}", "-i", path, "-map", "0:v:0"]
+            cmd += ["-vf", f"thumbnail,{scale}"]
+        else:
+            cmd += ["-i", path, "-map", f"0:{ff_index}", "-vf", scale]
+        cmd += ["-frames:v", "1", "-f", "mjpeg", "-y", tmp]
+
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            proc = Gio.Subprocess.new(
+                cmd,
+                Gio.SubprocessFlags.STDOUT_SILENCE | Gio.SubprocessFlags.STDERR_SILENCE,
+            )
+        except (OSError, GLib.Error) as e:
+            print(f"Artwork extraction skipped or failed: {e}")
+            return
+
+        cancel_id = cancellable.connect(lambda *a: proc.force_exit())
+        timeout_id = GLib.timeout_add_seconds(EXTRACT_TIMEOUT, cancellable.cancel)
+
+        def on_done(proc, result):
+            if not cancellable.is_cancelled():
+                GLib.source_remove(timeout_id)
+            cancellable.disconnect(cancel_id)
+            try:
+                proc.wait_check_finish(result)
+                os.replace(tmp, file)
+            except (OSError, GLib.Error) as e:
+                if not cancellable.is_cancelled():
+                    print(f"Artwork extraction skipped or failed: {e}")
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return
+
+            callback(GLib.filename_to_uri(file))
+            self._schedule_eviction()
+
+        proc.wait_check_async(cancellable, on_done)
+
+    def _schedule_eviction(self):
+        if not self._evicting:
+            self._evicting = True
+            threading.Thread(target=self._evict, daemon=True).start()
+
+    def _evict(self):
+        try:
+            entries = []
+            with os.scandir(self._dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".jpg"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError as e:
+            print(f"Artwork cache error: {e}")
+            entries = []
+
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= MAX_CACHE_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+        self._evicting = False
+
+
+artwork_cache = ArtworkCache()
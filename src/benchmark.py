@@ -0,0 +1,210 @@
+# benchmark.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import mpv
+import sys
+import json
+import time
+import ctypes
+import random
+import statistics
+
+from .player import create_player, terminate_player
+from .preferences import settings
+from .utils import SOFTWARE_RENDER
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+DECODE_SECONDS = 5
+SEEKS = 20
+TIMEOUT = 10
+# Offscreen size for the software render context
+SW_WIDTH, SW_HEIGHT = 1280, 720
+
+OBSERVED = (
+    "time-pos",
+    "pause",
+    "duration",
+    "volume",
+    "playlist-pos",
+    "track-list",
+    "chapter-list",
+    "media-title",
+    "idle-active",
+)
+
+
+class Offscreen:
+    """Render every new frame into memory with an "sw" context."""
+
+    def __init__(self, player):
+        from .render import render_sw
+
+        self._render_sw = render_sw
+        self._stride = SW_WIDTH * 4
+        self._buffer = ctypes.create_string_buffer(self._stride * SW_HEIGHT)
+        self._ctx = mpv.MpvRenderContext(player, "sw")
+        self._pending = False
+        self._ctx.update_cb = self._on_update
+        self.renders = 0
+
+    def _on_update(self):
+        if not self._pending:
+            self._pending = True
+            GLib.idle_add(self._render)
+
+    def _render(self):
+        self._pending = False
+        if self._ctx.update():
+            self._render_sw(self._ctx, SW_WIDTH, SW_HEIGHT, self._stride, self._buffer)
+            self._ctx.report_swap()
+            self.renders += 1
+        return False
+
+    def free(self):
+        self._ctx.update_cb = None
+        self._ctx.free()
+
+
+def _wait(predicate, timeout=TIMEOUT):
+    """Iterate the main loop until predicate() is true."""
+    context = GLib.MainContext.default()
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("mpv didn't respond in time")
+        context.iteration(True)
+
+
+def _percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else None
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def benchmark_file(path):
+    """Measure a single file, with the same mpv setup as the window."""
+    player = create_player()
+    player["vo"] = "libmpv" if SOFTWARE_RENDER else "null"
+    player["ao"] = "null"
+    player["hwdec"] = "auto" if settings.get_boolean("hwdec") else "no"
+    offscreen = Offscreen(player) if SOFTWARE_RENDER else None
+
+    restarts = []
+    ended = []
+    player.event_callback("playback-restart")(lambda _e: restarts.append(1))
+    player.event_callback("end-file")(lambda _e: ended.append(1))
+
+    observed = 0
+
+    def observer(_name, _value):
+        nonlocal observed
+        observed += 1
+
+    for name in OBSERVED:
+        player.observe_property(name, observer)
+
+    source = player._event_source
+    result = {"file": path}
+
+    try:
+        start = time.monotonic()
+        player.loadfile(path)
+        _wait(lambda: restarts or ended)
+        if not restarts:
+            raise RuntimeError("file failed to load")
+        result["time_to_first_frame_ms"] = _ms(time.monotonic() - start)
+        result["hwdec"] = player["hwdec-current"] or "no"
+
+        # Decode as fast as possible
+        player["untimed"] = True
+        frames_start = player["estimated-frame-number"] or 0
+        start = time.monotonic()
+        _wait(lambda: ended or time.monotonic() - start > DECODE_SECONDS)
+        elapsed = time.monotonic() - start
+        frames = (player["estimated-frame-number"] or 0) - frames_start
+        result["decode_fps"] = round(frames / elapsed, 2) if elapsed else None
+        result["frames"] = frames
+        result["dropped_frames"] = (player["frame-drop-count"] or 0) + (
+            player["decoder-frame-drop-count"] or 0
+        )
+        player["untimed"] = False
+
+        # Exact seeks to fixed pseudo-random points, paused
+        duration = player["duration"] or 0
+        latencies = []
+        if duration and not ended:
+            player.pause = True
+            rng = random.Random(0)
+            for _ in range(SEEKS):
+                count = len(restarts)
+                start = time.monotonic()
+                player.seek(rng.uniform(0, duration * 0.95), "absolute", "exact")
+                _wait(lambda: len(restarts) > count)
+                latencies.append(time.monotonic() - start)
+
+        result["seeks"] = len(latencies)
+        result["seek_avg_ms"] = _ms(statistics.fmean(latencies) if latencies else None)
+        result["seek_p99_ms"] = _ms(_percentile(latencies, 99))
+
+        result["events"] = source.events
+        result["observer_calls"] = observed
+        result["dispatch_us_per_event"] = (
+            round(source.busy_us / source.events, 2) if source.events else None
+        )
+        if offscreen:
+            result["renders"] = offscreen.renders
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        if offscreen:
+            offscreen.free()
+        terminate_player(player)
+
+    return result
+
+
+def run_benchmark(paths):
+    """Benchmark each file and print the results as JSON, returns the exit code."""
+    if not paths:
+        print("Usage: cine --benchmark FILE...", file=sys.stderr)
+        return 2
+
+    # Keep the main loop waking up while waiting for mpv
+    tick_id = GLib.timeout_add(50, lambda: True)
+    results = [benchmark_file(path) for path in paths]
+    GLib.source_remove(tick_id)
+
+    print(
+        json.dumps(
+            {
+                "vo": "sw" if SOFTWARE_RENDER else "null",
+                "decode_seconds": DECODE_SECONDS,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    return 1 if any("error" in r for r in results) else 0
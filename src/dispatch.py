@@ -0,0 +1,131 @@
+# dispatch.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import threading
+
+gi.require_version("GLib", "2.0")
+gi.require_version("Gtk", "4.0")
+from gi.repository import GLib, Gtk
+
+CRITICAL = 0
+COSMETIC = 1
+
+# Cosmetic updates wait for the next frame once a tick used this much time
+TICK_BUDGET_US = 4000
+# Hidden windows may stop getting frames, drain anyway after this long
+FALLBACK_MS = 100
+
+
+class PropertyDispatcher:
+    """Latest-value-wins slots for mpv observers, drained once per frame.
+
+    Observers can post from any thread, each key keeps only its last callback
+    and arguments. The widget's frame clock drains the slots on the main loop,
+    critical ones first, so wakeups are bounded by the display refresh rate.
+    """
+
+    def __init__(self, widget: Gtk.Widget):
+        self._widget = widget
+        self._slots: dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._armed = False
+        self._tick_id = 0
+        self._fallback_id = 0
+        self._last_drain = 0
+
+        self.ticks = 0
+        self.dispatched = 0
+
+    def post(self, key, callback, *args, priority=CRITICAL):
+        """Replace the pending update for key, and schedule a drain."""
+        with self._lock:
+            self._slots[key] = (priority, callback, args)
+            if self._armed:
+                return
+            self._armed = True
+
+        GLib.idle_add(self._arm, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _arm(self):
+        if not self._widget.get_mapped():
+            if self._drain():
+                GLib.idle_add(self._arm, priority=GLib.PRIORITY_HIGH_IDLE)
+            return False
+
+        if not self._tick_id:
+            self._tick_id = self._widget.add_tick_callback(self._on_tick)
+        if not self._fallback_id:
+            self._fallback_id = GLib.timeout_add(FALLBACK_MS, self._on_fallback)
+        return False
+
+    def _on_tick(self, _widget, _frame_clock):
+        if self._drain():
+            return GLib.SOURCE_CONTINUE
+
+        self._tick_id = 0
+        if self._fallback_id:
+            GLib.source_remove(self._fallback_id)
+            self._fallback_id = 0
+        return GLib.SOURCE_REMOVE
+
+    def _on_fallback(self):
+        if GLib.get_monotonic_time() - self._last_drain < FALLBACK_MS * 1000:
+            return GLib.SOURCE_CONTINUE
+
+        if self._drain():
+            return GLib.SOURCE_CONTINUE
+
+        self._fallback_id = 0
+        if self._tick_id:
+            self._widget.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
+        return GLib.SOURCE_REMOVE
+
+    def _drain(self):
+        """Run pending updates, return True if some are left for later."""
+        with self._lock:
+            slots, self._slots = self._slots, {}
+
+        start = GLib.get_monotonic_time()
+        deferred = {}
+        self.ticks += 1
+
+        for key, slot in sorted(slots.items(), key=lambda item: item[1][0]):
+            priority, callback, args = slot
+            if priority == COSMETIC and GLib.get_monotonic_time() - start > TICK_BUDGET_US:
+                deferred[key] = slot
+                continue
+
+            try:
+                callback(*args)
+                self.dispatched += 1
+            except Exception as e:
+                print(f"Dispatch error ({key}): {e}")
+
+        self._last_drain = GLib.get_monotonic_time()
+
+        with self._lock:
+            for key, slot in deferred.items():
+                # Newer posts replace what was deferred
+                self._slots.setdefault(key, slot)
+            if self._slots:
+                return True
+            self._armed = False
+            return False
@@ -0,0 +1,205 @@
+# events.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import mpv
+import ctypes
+import threading
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+# Events handled per main loop iteration, the rest continue on idle
+BATCH_SIZE = 64
+
+# _dispatch mirrors MPV._loop and uses python-mpv's private attributes,
+# it was written against these versions
+PYTHON_MPV_VERSIONS = ("1.0.",)
+if not mpv.__version__.startswith(PYTHON_MPV_VERSIONS):
+    raise ImportError(
+        f"python-mpv {mpv.__version__} is not supported, "
+        f"MpvEventSource needs {' or '.join(PYTHON_MPV_VERSIONS)}x"
+    )
+
+_get_wakeup_pipe = getattr(mpv.backend, "mpv_get_wakeup_pipe", None)
+if _get_wakeup_pipe:
+    _get_wakeup_pipe.argtypes = [mpv.MpvHandle]
+    _get_wakeup_pipe.restype = ctypes.c_int
+
+
+class MpvEventSource:
+    """Drain a player's mpv events on the GLib main loop.
+
+    Replaces python-mpv's event thread: the wakeup pipe of the event client
+    is watched by the main context, or without one mpv's wakeup callback
+    schedules the drain, so callbacks and property observers always run on
+    the main thread. Players must be created with start_event_thread=False.
+    """
+
+    def __init__(self, player: mpv.MPV, batch_size=BATCH_SIZE):
+        self._player = player
+        self._handle = player._event_handle
+        self._batch_size = batch_size
+        self._fd_id = 0
+        self._idle_id = 0
+        self._destroyed = False
+        self._wakeup_cb = None
+        self._lock = threading.Lock()
+        self._woken = False
+
+        self.events = 0
+        self.wakeups = 0
+        self.busy_us = 0
+
+        fd = _get_wakeup_pipe(self._handle) if _get_wakeup_pipe else -1
+        if fd < 0:
+            # No wakeup pipe, mpv's wakeup callback hops to the main loop instead
+            self._wakeup_cb = mpv.WakeupCallback(self._on_wakeup_callback)
+            mpv._mpv_set_wakeup_callback(self._handle, self._wakeup_cb, None)
+            return
+
+        self._fd_id = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, fd, GLib.IOCondition.IN, self._on_wakeup
+        )
+
+    def _on_wakeup(self, fd, _condition):
+        try:
+            while os.read(fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+        self.wakeups += 1
+        if not self._idle_id and self._drain():
+            self._idle_id = GLib.idle_add(self._on_idle)
+        return self._fd_id != 0
+
+    def _on_wakeup_callback(self, _data):
+        # Called from mpv threads, must not call into mpv
+        with self._lock:
+            if self._woken:
+                return
+            self._woken = True
+        GLib.idle_add(self._on_wakeup_idle, priority=GLib.PRIORITY_DEFAULT)
+
+    def _on_wakeup_idle(self):
+        with self._lock:
+            self._woken = False
+        self.wakeups += 1
+        if not self._idle_id and self._drain():
+            self._idle_id = GLib.idle_add(self._on_idle)
+        return GLib.SOURCE_REMOVE
+
+    def _on_idle(self):
+        if self._drain():
+            return GLib.SOURCE_CONTINUE
+        self._idle_id = 0
+        return GLib.SOURCE_REMOVE
+
+    def _drain(self):
+        """Handle up to a batch of events, return True if more may be queued."""
+        start = GLib.get_monotonic_time()
+        try:
+            for _ in range(self._batch_size):
+                if self._destroyed:
+                    return False
+                event = mpv._mpv_wait_event(self._handle, 0).contents
+                if event.event_id.value == mpv.MpvEventID.NONE:
+                    return False
+                self.events += 1
+                self._dispatch(event)
+            return not self._destroyed
+        finally:
+            self.busy_us += GLib.get_monotonic_time() - start
+
+    def _dispatch(self, event):
+        """Same handling as MPV._loop, for a single event."""
+        player = self._player
+        eid = event.event_id.value
+
+        try:
+            if eid == mpv.MpvEventID.SHUTDOWN:
+                with player._event_handler_lock:
+                    player._core_shutdown = True
+
+            for callback in player._event_callbacks:
+                with player._enqueue_exceptions():
+                    callback(event)
+
+            if eid == mpv.MpvEventID.PROPERTY_CHANGE:
+                pc = event.data
+                for handler in player._property_handlers[pc.name]:
+                    with player._enqueue_exceptions():
+                        handler(pc.name, pc.value)
+
+            if eid == mpv.MpvEventID.LOG_MESSAGE and player._log_handler is not None:
+                ev = event.data
+                with player._enqueue_exceptions():
+                    player._log_handler(ev.level, ev.prefix, ev.text)
+
+            if eid == mpv.MpvEventID.CLIENT_MESSAGE:
+                target, *args = event.data.args
+                target = target.decode("utf-8")
+                if target in player._message_handlers:
+                    with player._enqueue_exceptions():
+                        player._message_handlers[target](*args)
+
+            if eid == mpv.MpvEventID.COMMAND_REPLY:
+                key = event.reply_userdata
+                callback = player._command_reply_callbacks.pop(key, None)
+                if callback:
+                    with player._enqueue_exceptions():
+                        callback(mpv.ErrorCode.exception_for_ec(event.error), event.data)
+
+            if eid == mpv.MpvEventID.QUEUE_OVERFLOW:
+                for callback in list(player._command_reply_callbacks.values()):
+                    with player._enqueue_exceptions():
+                        callback(
+                            mpv.EventOverflowError("libmpv event queue overflowed"),
+                            None,
+                        )
+
+            if eid == mpv.MpvEventID.SHUTDOWN:
+                self.destroy()
+                for callback in list(player._command_reply_callbacks.values()):
+                    with player._enqueue_exceptions():
+                        callback(mpv.ShutdownError("libmpv core has been shutdown"), None)
+        except Exception as e:
+            print(f"mpv event error: {e}")
+
+    def detach(self):
+        """Stop watching the player, pending events stay queued."""
+        if self._fd_id:
+            GLib.source_remove(self._fd_id)
+            self._fd_id = 0
+        if self._wakeup_cb:
+            mpv._mpv_set_wakeup_callback(self._handle, mpv.WakeupCallback(), None)
+            self._wakeup_cb = None
+        if self._idle_id:
+            GLib.source_remove(self._idle_id)
+            self._idle_id = 0
+
+    def destroy(self):
+        """Detach and destroy the event client, mpv waits for it on shutdown."""
+        if self._destroyed:
+            return
+        self.detach()
+        self._destroyed = True
+        mpv._mpv_destroy(self._handle)
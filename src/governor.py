@@ -0,0 +1,114 @@
+# governor.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import time
+
+from .preferences import settings
+from .utils import PROFILE
+
+gi.require_version("Gdk", "4.0")
+from gi.repository import Gdk
+
+HIDDEN_STATES = Gdk.ToplevelState.MINIMIZED | Gdk.ToplevelState.SUSPENDED
+
+
+class VisibilityGovernor:
+    """Suspend video work while the window is minimized or suspended.
+
+    Rendering stops while hidden. With background-audio-only the video track
+    is turned off as well. On restore the vid option comes back as it was,
+    with an exact seek if the same file is still playing.
+    Wall and process CPU time are counted per state, see stats().
+    """
+
+    def __init__(self, win):
+        self._win = win
+        self._hidden = False
+        self._vid = None
+        self._path = ""
+
+        self._since = time.monotonic()
+        self._cpu_since = time.process_time()
+        # [wall seconds, CPU seconds] spent visible and hidden
+        self._visible = [0.0, 0.0]
+        self._hidden_totals = [0.0, 0.0]
+
+    def on_state_changed(self, toplevel, _pspec):
+        hidden = bool(toplevel.get_state() & HIDDEN_STATES)
+        if hidden == self._hidden:
+            return
+
+        self._account()
+        self._hidden = hidden
+        if hidden:
+            self._suspend()
+        else:
+            self._resume()
+
+    def _account(self):
+        now, cpu = time.monotonic(), time.process_time()
+        totals = self._hidden_totals if self._hidden else self._visible
+        totals[0] += now - self._since
+        totals[1] += cpu - self._cpu_since
+        self._since, self._cpu_since = now, cpu
+
+    def _suspend(self):
+        self._win.render_scheduler.suspend()
+
+        mpv = self._win.mpv
+        if not settings.get_boolean("background-audio-only") or mpv.idle_active:
+            return
+
+        if mpv.vid:
+            # The option, usually "auto". The vid property is the track
+            # picked for this file and would pin it for the next ones
+            self._vid = mpv["options/vid"]
+            self._path = self._win.loaded_path
+            mpv.vid = "no"
+
+    def _resume(self):
+        self._win.render_scheduler.resume()
+
+        if self._vid is not None:
+            mpv = self._win.mpv
+            mpv.vid = self._vid
+            self._vid = None
+            # A file started while hidden opens at its own position already
+            if self._win.loaded_path == self._path and mpv.time_pos is not None:
+                mpv.seek(mpv.time_pos, "absolute", "exact")
+
+        if PROFILE:
+            print(f"[cine] Visibility: {self.stats()}")
+
+    def stats(self):
+        self._account()
+        hidden_wall, hidden_cpu = self._hidden_totals
+        visible_wall, visible_cpu = self._visible
+        if not hidden_wall or not visible_wall:
+            return f"hidden {hidden_wall:.1f} s"
+
+        hidden_load = hidden_cpu / hidden_wall
+        visible_load = visible_cpu / visible_wall
+        saved = max(0.0, (visible_load - hidden_load) * hidden_wall)
+        return (
+            f"hidden {hidden_wall:.1f} s at {hidden_load:.0%} CPU, "
+            f"visible at {visible_load:.0%}, ~{saved:.1f} CPU s saved, "
+            f"{self._win.render_scheduler.skipped} frames not rendered"
+        )
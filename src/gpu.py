@@ -0,0 +1,194 @@
+# gpu.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import glob
+import json
+import ctypes
+
+from .utils import CONFIG_DIR
+
+gi.require_version("Gdk", "4.0")
+from gi.repository import Gdk
+
+GPU_CACHE = os.path.join(CONFIG_DIR, "gpu.json")
+
+GL_VENDOR = 0x1F00
+GL_RENDERER = 0x1F01
+GL_VERSION = 0x1F02
+
+_caps: dict | None = None
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _loaded_path(soname):
+    """Real path of a library this process has loaded, from /proc/self/maps."""
+    try:
+        with open("/proc/self/maps") as f:
+            for line in f:
+                path = line.rstrip("\n").partition(" /")[2]
+                if path and os.path.basename(path).startswith(soname):
+                    return os.path.realpath(f"/{path}")
+    except OSError:
+        pass
+    return None
+
+
+def _userspace_key():
+    """Identify the GL vendor libraries, Mesa and NVIDIA updates replace them.
+
+    With glvnd libGL.so.1 only dispatches, the drivers are its libGLX_*,
+    libEGL_* and libgallium-* neighbours, also in GL/*/lib for Flatpak.
+    """
+    libgl = _loaded_path("libGL.so")
+    if not libgl:
+        return ""
+
+    lib_dir = os.path.dirname(libgl)
+    paths = {libgl}
+    for pattern in ("libGLX_*.so*", "libEGL_*.so*", "libgallium*.so"):
+        for directory in (lib_dir, os.path.join(lib_dir, "GL", "*", "lib")):
+            paths.update(glob.glob(os.path.join(directory, pattern)))
+
+    parts = []
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        parts.append(f"{os.path.realpath(path)}:{st.st_size}:{st.st_mtime_ns}")
+    return "|".join(parts)
+
+
+def _driver_key():
+    """Identify the GPU drivers from sysfs and the GL libraries on disk.
+
+    No GL context is created, so a driver update is noticed before probing.
+    """
+    parts = []
+    for card in sorted(glob.glob("/sys/class/drm/card[0-9]*")):
+        # Skip connectors like card0-HDMI-A-1
+        if "-" in os.path.basename(card):
+            continue
+        device = os.path.join(card, "device")
+        driver = os.path.basename(os.path.realpath(os.path.join(device, "driver")))
+        version = _read(f"/sys/module/{driver}/version")
+        ids = _read(os.path.join(device, "vendor")), _read(os.path.join(device, "device"))
+        parts.append(f"{driver}:{version}:{':'.join(ids)}")
+
+    if not parts:
+        return None
+
+    return f"{os.uname().release}|{'|'.join(parts)}|{_userspace_key()}"
+
+
+def _probe_gl(display, libgl):
+    """Create a GL context once to read the vendor, renderer and version."""
+    no_gl = {"gl": False, "vendor": "", "renderer": "", "gl_version": ""}
+    if not libgl:
+        return no_gl
+
+    glGetString = libgl.glGetString
+    glGetString.restype = ctypes.c_char_p
+    glGetString.argtypes = [ctypes.c_uint]
+
+    try:
+        context = display.create_gl_context()
+        context.realize()
+        context.make_current()
+
+        def get(name):
+            value = glGetString(name)
+            return value.decode("utf-8") if value else ""
+
+        caps = {
+            "gl": True,
+            "vendor": get(GL_VENDOR).lower(),
+            "renderer": get(GL_RENDERER),
+            "gl_version": get(GL_VERSION),
+        }
+        Gdk.GLContext.clear_current()
+        return caps
+    except Exception as e:
+        print(f"GPU probe error: {e}")
+        return no_gl
+
+
+def _dmabuf_formats(display):
+    if not hasattr(display, "get_dmabuf_formats"):
+        return []
+
+    formats = display.get_dmabuf_formats()
+    fourccs = set()
+    for i in range(formats.get_n_formats()):
+        fourcc, _modifier = formats.get_format(i)
+        fourccs.add(fourcc.to_bytes(4, "little").decode("ascii", "replace"))
+    return sorted(fourccs)
+
+
+def _load():
+    try:
+        with open(GPU_CACHE) as f:
+            saved = json.load(f)
+        return saved if isinstance(saved, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(saved):
+    try:
+        with open(GPU_CACHE, "w") as f:
+            json.dump(saved, f, indent=2)
+    except OSError as e:
+        print(f"GPU cache error: {e}")
+
+
+def get_gpu_caps(display, libgl):
+    """Return GPU facts, probed once per process and saved for the driver.
+
+    Keys: gl, vendor, renderer, gl_version, dmabuf_formats and offload
+    (whether Gtk.GraphicsOffload should be used). libgl may be None.
+    """
+    global _caps
+    if _caps is not None:
+        return _caps
+
+    key = _driver_key()
+    saved = _load()
+    caps = saved.get(key) if key else None
+
+    if not caps:
+        caps = _probe_gl(display, libgl)
+        caps["dmabuf_formats"] = _dmabuf_formats(display)
+        caps["offload"] = "nvidia" not in caps["vendor"]
+
+        if key and caps["gl"]:
+            # Entries of older drivers never match again
+            _save({key: caps})
+
+    _caps = caps
+    return caps
@@ -17,11 +17,14 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import time
+
+LAUNCH_TIME = time.monotonic()
+
 import os
 import gi
 import sys
-import subprocess
-from typing import cast
+from typing import cast, TYPE_CHECKING
 from gettext import gettext as _
 
 gi.require_version("Adw", "1")
@@ -29,14 +32,162 @@ gi.require_version("Gio", "2.0")
 gi.require_version("GLib", "2.0")
 gi.require_version("Gtk", "4.0")
 from gi.repository import Adw, Gio, GLib, Gtk
-from .window import CineWindow
 from .preferences import Preferences, settings
-from .mpris import MPRIS
+from .metadata import metadata_cache
+from .utils import log_timing, PROFILE
+
+# window.py loads GL and mpv, it is imported only when a window is created,
+# so launches that just forward files to a running instance stay fast
+if TYPE_CHECKING:
+    from .window import CineWindow
+
+HEAVY_MODULES = ("mpv", f"{__package__}.window")
 
 # Set the icon shown in gnome sound settings
 os.environ["PIPEWIRE_PROPS"] = '{application.icon-name="io.github.diegopvlk.Cine"}'
 
 
+class FirstFileFinder:
+    """Walk files and folders with async Gio calls until a regular file is found.
+
+    Folders are searched depth-first like a recursive walk would,
+    limited by max_depth and by the number of entries read.
+    """
+
+    BATCH_SIZE = 64
+
+    def __init__(self, gfiles, cancellable, callback, max_depth=8, max_entries=5000):
+        self.cancellable: Gio.Cancellable = cancellable
+        self.callback = callback
+        self.max_depth = max_depth
+        self.budget = max_entries
+        self.visited: set[str] = set()
+        # (gfile, depth, known to be a directory)
+        self.stack = [(gfile, 0, False) for gfile in reversed(list(gfiles))]
+        self._next()
+
+    def _finish(self, path):
+        self.stack.clear()
+        if path and not self.cancellable.is_cancelled():
+            self.callback(path)
+
+    def _failed(self, error):
+        if not error.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+            self._next()
+
+    def _next(self):
+        while self.stack and not self.cancellable.is_cancelled():
+            gfile, depth, is_dir = self.stack.pop()
+            path = gfile.get_path()
+
+            if gfile.get_uri_scheme() != "file" or not path or path in self.visited:
+                continue
+            self.visited.add(path)
+
+            if is_dir:
+                self._enumerate(gfile, depth)
+            else:
+                gfile.query_info_async(
+                    "standard::type",
+                    Gio.FileQueryInfoFlags.NOFOLLOW_SYMLINKS,
+                    GLib.PRIORITY_DEFAULT,
+                    self.cancellable,
+                    self._on_info,
+                    depth,
+                )
+            return
+
+        self._finish(None)
+
+    def _on_info(self, gfile, result, depth):
+        try:
+            info = gfile.query_info_finish(result)
+        except GLib.Error as e:
+            self._failed(e)
+            return
+
+        f_type = info.get_file_type()
+        if f_type == Gio.FileType.REGULAR:
+            self._finish(gfile.get_path())
+        elif f_type == Gio.FileType.DIRECTORY:
+            self._enumerate(gfile, depth)
+        else:
+            self._next()
+
+    def _enumerate(self, gfile, depth):
+        if depth > self.max_depth:
+            self._next()
+            return
+
+        gfile.enumerate_children_async(
+            "standard::name,standard::type",
+            Gio.FileQueryInfoFlags.NOFOLLOW_SYMLINKS,
+            GLib.PRIORITY_DEFAULT,
+            self.cancellable,
+            self._on_enumerate,
+            depth,
+        )
+
+    def _on_enumerate(self, gfile, result, depth):
+        try:
+            enumerator = gfile.enumerate_children_finish(result)
+        except GLib.Error as e:
+            self._failed(e)
+            return
+
+        enumerator.next_files_async(
+            self.BATCH_SIZE,
+            GLib.PRIORITY_DEFAULT,
+            self.cancellable,
+            self._on_next_files,
+            (gfile, depth, []),
+        )
+
+    def _on_next_files(self, enumerator, result, data):
+        gfile, depth, subdirectories = data
+        try:
+            infos = enumerator.next_files_finish(result)
+        except GLib.Error as e:
+            enumerator.close_async(GLib.PRIORITY_DEFAULT, None, None)
+            self._failed(e)
+            return
+
+        for info in infos:
+            self.budget -= 1
+            name = info.get_name()
+
+            if name.startswith("."):
+                continue
+
+            child_type = info.get_file_type()
+            if child_type == Gio.FileType.REGULAR:
+                enumerator.close_async(GLib.PRIORITY_DEFAULT, None, None)
+                self._finish(gfile.get_child(name).get_path())
+                return
+            elif child_type == Gio.FileType.DIRECTORY:
+                subdirectories.append(gfile.get_child(name))
+
+        if self.budget <= 0:
+            enumerator.close_async(GLib.PRIORITY_DEFAULT, None, None)
+            self._finish(None)
+            return
+
+        if infos:
+            enumerator.next_files_async(
+                self.BATCH_SIZE,
+                GLib.PRIORITY_DEFAULT,
+                self.cancellable,
+                self._on_next_files,
+                data,
+            )
+            return
+
+        enumerator.close_async(GLib.PRIORITY_DEFAULT, None, None)
+        for folder in reversed(subdirectories):
+            self.stack.append((folder, depth + 1, True))
+        self._next()
+
+
 class CineApplication(Adw.Application):
     """The main application singleton class."""
 
@@ -55,11 +206,22 @@ class CineApplication(Adw.Application):
             "Open a new window",
             None,
         )
+        self.add_main_option(
+            "benchmark",
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            "Measure playback of FILE... without a window, print JSON",
+            None,
+        )
 
         self.connect("window-removed", self._on_window_removed)
+        self.launch_time = LAUNCH_TIME
 
     def do_startup(self):
-        MPRIS(self)
+        from .player import PlayerPool
+
+        self.player_pool = PlayerPool()
 
         Adw.Application.do_startup(self)
         Adw.StyleManager.get_default().props.color_scheme = Adw.ColorScheme.FORCE_DARK
@@ -71,13 +233,23 @@ class CineApplication(Adw.Application):
             "preferences", self.on_preferences_action, ["<primary>comma"]
         )
 
+    def do_shutdown(self):
+        metadata_cache.flush()
+        self.player_pool.clear()
+        Adw.Application.do_shutdown(self)
+
     def do_activate(self):
+        from .window import CineWindow
+
         win = CineWindow(application=self)
-        win.present()
+        self._present(win, time.monotonic())
 
     def do_open(  # pyright: ignore[reportIncompatibleMethodOverride]
         self, gfiles, _n_files, _hint
     ):
+        from .window import CineWindow
+
+        open_time = time.monotonic()
         win: CineWindow = cast(CineWindow, self.props.active_window)
         open_new = settings.get_boolean("open-new-windows") or not win
 
@@ -85,47 +257,17 @@ class CineApplication(Adw.Application):
             win = CineWindow(application=self)
             win.start_page.set_visible(False)
 
-            first_video_path = None
-            for gfile in gfiles:
-                first_video_path = self.find_first_file(gfile)
-
-                if first_video_path:
-                    break
-
-            if first_video_path:
-                try:
-                    cmd = [
-                        "ffprobe",
-                        "-v",
-                        "error",
-                        "-select_streams",
-                        "v:0",
-                        "-show_entries",
-                        "stream=width,height",
-                        "-of",
-                        "csv=s=x:p=0",
-                        first_video_path,
-                    ]
-                    output = subprocess.check_output(
-                        cmd, text=True, timeout=2, stderr=subprocess.DEVNULL
-                    ).strip()
-
-                    if output:
-                        # 1920x1080
-                        res = output.splitlines()[0].split("x")
-                        if len(res) >= 2:
-                            win._set_window_size(int(res[0]), int(res[1]))
-                except Exception as e:
-                    print(f"Metadata probe skipped or failed: {e}")
-            win.present()
+            self._present(win, open_time)
+
+            # The window is already up, resize it as soon as a file is found
+            self.find_first_file(gfiles, win.cancellable, win.probe_window_size)
         else:
             win.present()
             win.mpv.stop()
 
-        for gfile in gfiles:
-            path = gfile.get_path() or gfile.get_uri()
-            if path:
-                win.mpv.loadfile(path, "append-play")
+        # Folders among the arguments are expanded in the background
+        paths = [gfile.get_path() or gfile.get_uri() for gfile in gfiles]
+        win.add_paths(paths, "replace", scan=True)
 
         for window in self.get_windows():
             w = cast(CineWindow, window)
@@ -134,63 +276,38 @@ class CineApplication(Adw.Application):
 
         win._hide_ui_timeout()
 
-    def find_first_file(self, gfile, visited=None):
-        """Local-only recursive search."""
-        if gfile.get_uri_scheme() != "file":
-            return None
-
-        if visited is None:
-            visited = set()
-
-        path = gfile.get_path()
-        if not path or path in visited:
-            return None
-        visited.add(path)
-
-        try:
-            info = gfile.query_info(
-                "standard::type", Gio.FileQueryInfoFlags.NOFOLLOW_SYMLINKS, None
-            )
-            f_type = info.get_file_type()
-
-            if f_type == Gio.FileType.REGULAR:
-                return path
-
-            if f_type == Gio.FileType.DIRECTORY:
-                enumerator = gfile.enumerate_children(
-                    "standard::name,standard::type",
-                    Gio.FileQueryInfoFlags.NOFOLLOW_SYMLINKS,
-                    None,
-                )
-
-                subdirectories = []
-                for child in enumerator:
-                    child_type = child.get_file_type()
-                    name = child.get_name()
-
-                    if name.startswith("."):
-                        continue
+    def _present(self, win, start):
+        win.present()
+        log_timing("Open to present", start)
+        if self.launch_time:
+            log_timing("Launch to present", self.launch_time)
+            self.launch_time = 0
 
-                    if child_type == Gio.FileType.REGULAR:
-                        return gfile.get_child(name).get_path()
-                    elif child_type == Gio.FileType.DIRECTORY:
-                        subdirectories.append(gfile.get_child(name))
+        # Prepare the next window's mpv after this one settles
+        self.player_pool.schedule_fill()
 
-                for folder in subdirectories:
-                    found = self.find_first_file(folder, visited)
-                    if found:
-                        return found
-        except Exception:
-            pass
-        return None
+    def find_first_file(self, gfiles, cancellable, callback):
+        """Local-only asynchronous search, callback gets the first file path."""
+        FirstFileFinder(gfiles, cancellable, callback)
 
     # From showtime
     def do_handle_local_options(self, options: GLib.VariantDict):
         """Handle local command line arguments."""
+        if options.contains("benchmark"):
+            from .benchmark import run_benchmark
+
+            return run_benchmark([a for a in sys.argv[1:] if not a.startswith("-")])
+
         self.register()  # This is so props.is_remote works
 
         if self.props.is_remote:
-            if options.contains("new-window"):
+            has_files = any(not arg.startswith("-") for arg in sys.argv[1:])
+            if PROFILE:
+                heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+                log_timing("Remote launch", LAUNCH_TIME)
+                print(f"[cine] Heavy modules loaded: {', '.join(heavy) or 'none'}")
+
+            if options.contains("new-window") or has_files:
                 return -1
 
             print("Cine is runnning, to open a new window, run with --new-window.")
@@ -261,6 +378,7 @@ class CineApplication(Adw.Application):
             self.set_accels_for_action(f"app.{name}", shortcuts)
 
     def _on_window_removed(self, _obj, win):
+        win.mpris.close()
         win.mpv.quit()
 
 
@@ -0,0 +1,277 @@
+# metadata.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .utils import CONFIG_DIR
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+DB_PATH = os.path.join(CONFIG_DIR, "metadata.db")
+FIELDS = ("width", "height", "duration", "chapters", "tracks", "title")
+JSON_FIELDS = ("chapters", "tracks")
+TRACK_KEYS = ("id", "type", "lang", "title", "codec", "albumart", "external")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    duration REAL,
+    chapters TEXT,
+    tracks TEXT,
+    title TEXT
+) WITHOUT ROWID
+"""
+
+
+# Entries kept in memory, the main loop only reads from there
+MEMORY_SIZE = 4096
+# Seconds before a remembered entry is checked against the file again
+MEMORY_TTL = 30
+
+
+class MetadataCache:
+    """Media info keyed by path, invalidated when size or mtime change.
+
+    Lookups on the main loop are answered from an in-memory LRU. Misses are
+    loaded by a worker thread, which stats the file and reads the database,
+    so the main loop never waits on the disk. Writes are batched from an
+    idle callback and committed by the same worker.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self._path = path
+        self._db: sqlite3.Connection | None = None
+        self._jobs: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        # path: (loaded at, info or None), most recently used last
+        self._memory: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._waiting: dict[str, list] = {}
+        self._pending: dict[str, dict] = {}
+        self._flush_id = 0
+
+    def _connect(self):
+        # Only used from the worker thread
+        if self._db is None:
+            self._db = sqlite3.connect(self._path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(SCHEMA)
+        return self._db
+
+    @staticmethod
+    def _stat(path):
+        if not path or "://" in path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _queue(self, job):
+        self._jobs.put(job)
+        if not self._worker:
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+
+    def lookup(self, path):
+        """Return the remembered fields for path, or None.
+
+        It never touches the disk, a miss loads the entry in the background
+        so a later lookup finds it.
+        """
+        if not path or "://" in path:
+            return None
+
+        path = os.path.abspath(path)
+        cached = self._memory.get(path)
+        if cached is None or time.monotonic() - cached[0] > MEMORY_TTL:
+            self._load(path, None)
+        if cached is None:
+            return None
+
+        self._memory.move_to_end(path)
+        info = cached[1]
+        return dict(info) if info else None
+
+    def lookup_async(self, path, callback):
+        """Call callback(info) on the main loop, info is None if missing or stale."""
+        if not path or "://" in path:
+            callback(None)
+            return
+
+        path = os.path.abspath(path)
+        cached = self._memory.get(path)
+        if cached and time.monotonic() - cached[0] <= MEMORY_TTL:
+            self._memory.move_to_end(path)
+            callback(dict(cached[1]) if cached[1] else None)
+            return
+
+        self._load(path, callback)
+
+    def _load(self, path, callback):
+        callbacks = self._waiting.get(path)
+        if callbacks is None:
+            callbacks = self._waiting[path] = []
+            self._queue(("load", path))
+        if callback:
+            callbacks.append(callback)
+
+    def _read(self, path):
+        stat = self._stat(path)
+        if not stat:
+            return None
+
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    f"SELECT size, mtime, {', '.join(FIELDS)} FROM media WHERE path = ?",
+                    (path,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            print(f"Metadata cache error: {e}")
+            return None
+
+        if not row or (row[0], row[1]) != stat:
+            return None
+
+        info = dict(zip(FIELDS, row[2:]))
+        for key in JSON_FIELDS:
+            if info[key] is not None:
+                info[key] = json.loads(info[key])
+        return info
+
+    def _deliver(self, path, info):
+        # Fields not written yet are newer than the database
+        pending = self._pending.get(path)
+        if pending:
+            info = {**dict.fromkeys(FIELDS), **(info or {}), **pending}
+
+        self._remember(path, info)
+        for callback in self._waiting.pop(path, []):
+            callback(dict(info) if info else None)
+        return GLib.SOURCE_REMOVE
+
+    def _remember(self, path, info):
+        self._memory[path] = (time.monotonic(), info)
+        self._memory.move_to_end(path)
+        while len(self._memory) > MEMORY_SIZE:
+            self._memory.popitem(last=False)
+
+    def update(self, path, **fields):
+        """Merge fields into the entry for path, the write happens on idle."""
+        if not path or "://" in path:
+            return
+
+        path = os.path.abspath(path)
+        if "tracks" in fields and fields["tracks"]:
+            fields["tracks"] = [
+                {k: t[k] for k in TRACK_KEYS if k in t} for t in fields["tracks"]
+            ]
+
+        fields = {k: v for k, v in fields.items() if k in FIELDS}
+        self._pending.setdefault(path, {}).update(fields)
+
+        cached = self._memory.get(path)
+        info = cached[1] if cached else None
+        self._remember(path, {**dict.fromkeys(FIELDS), **(info or {}), **fields})
+
+        if not self._flush_id:
+            self._flush_id = GLib.idle_add(
+                self._flush_idle, priority=GLib.PRIORITY_LOW
+            )
+
+    def _flush_idle(self):
+        self._flush_id = 0
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            self._queue(("write", pending))
+        return GLib.SOURCE_REMOVE
+
+    def flush(self):
+        """Write pending entries to disk and wait for the worker to finish."""
+        if self._flush_id:
+            GLib.source_remove(self._flush_id)
+        self._flush_idle()
+        if self._worker:
+            self._jobs.join()
+
+    def _write(self, pending):
+        rows = []
+        for path, fields in pending.items():
+            stat = self._stat(path)
+            if not stat:
+                continue
+            values = [fields.get(k) for k in FIELDS]
+            for i, key in enumerate(FIELDS):
+                if key in JSON_FIELDS and values[i] is not None:
+                    values[i] = json.dumps(values[i])
+            rows.append((path, *stat, *values))
+
+        columns = ", ".join(("path", "size", "mtime") + FIELDS)
+        marks = ", ".join("?" * (len(FIELDS) + 3))
+        # Fields not given keep their value, unless the file changed
+        same_file = "size = excluded.size AND mtime = excluded.mtime"
+        updates = ", ".join(
+            f"{k} = CASE WHEN {same_file} THEN COALESCE(excluded.{k}, {k}) "
+            f"ELSE excluded.{k} END"
+            for k in FIELDS
+        )
+
+        try:
+            db = self._connect()
+            with db:
+                db.executemany(
+                    f"INSERT INTO media ({columns}) VALUES ({marks}) "
+                    f"ON CONFLICT(path) DO UPDATE SET {updates}, "
+                    "size = excluded.size, mtime = excluded.mtime",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            print(f"Metadata cache error: {e}")
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job[0] == "load":
+                    info = self._read(job[1])
+                    GLib.idle_add(self._deliver, job[1], info)
+                else:
+                    self._write(job[1])
+            finally:
+                self._jobs.task_done()
+
+
+metadata_cache = MetadataCache()
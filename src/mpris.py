@@ -18,6 +18,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import gi
+import os
+import itertools
+import threading
 
 gi.require_version("Gio", "2.0")
 gi.require_version("GLib", "2.0")
@@ -25,11 +28,13 @@ gi.require_version("Gtk", "4.0")
 from gi.repository import Gio, GLib, Gtk
 from gettext import gettext as _
 
+from .metadata import metadata_cache
+from .tracklist import NO_TRACK, TrackList, track_path
+
 APP_ID = "io.github.diegopvlk.Cine"
 
 # This is a mess, but it (kinda) works :D
-# Keep PlaybackStatus, Metadata and CanSeek commented, it causes stutters
-# those will come from _sync_player_state and _update_props
+# Properties are answered from the window's PlayerState, see _get_player_property
 INTERFACE = """
 <!DOCTYPE node PUBLIC
 '-//freedesktop//DTD D-BUS Object Introspection 1.0//EN'
@@ -63,11 +68,9 @@ INTERFACE = """
         <signal name='Seeked'>
             <arg name='Position' type='x'/>
         </signal>
-        <!--
         <property name='PlaybackStatus' type='s' access='read'/>
         <property name='Metadata' type='a{sv}' access='read'/>
         <property name='CanSeek' type='b' access='read'/>
-        -->
         <property name='LoopStatus' type='s' access='readwrite'/>
         <property name='Volume' type='d' access='readwrite'/>
         <property name='Position' type='x' access='read'/>
@@ -78,50 +81,182 @@ INTERFACE = """
         <property name='CanControl' type='b' access='read'/>
         <property name='Shuffle' type='b' access='readwrite'/>
     </interface>
+    <interface name='org.mpris.MediaPlayer2.TrackList'>
+        <method name='GetTracksMetadata'>
+            <arg direction='in' name='TrackIds' type='ao'/>
+            <arg direction='out' name='Metadata' type='aa{sv}'/>
+        </method>
+        <method name='AddTrack'>
+            <arg direction='in' name='Uri' type='s'/>
+            <arg direction='in' name='AfterTrack' type='o'/>
+            <arg direction='in' name='SetAsCurrent' type='b'/>
+        </method>
+        <method name='RemoveTrack'>
+            <arg direction='in' name='TrackId' type='o'/>
+        </method>
+        <method name='GoTo'>
+            <arg direction='in' name='TrackId' type='o'/>
+        </method>
+        <signal name='TrackListReplaced'>
+            <arg name='Tracks' type='ao'/>
+            <arg name='CurrentTrack' type='o'/>
+        </signal>
+        <signal name='TrackAdded'>
+            <arg name='Metadata' type='a{sv}'/>
+            <arg name='AfterTrack' type='o'/>
+        </signal>
+        <signal name='TrackRemoved'>
+            <arg name='TrackId' type='o'/>
+        </signal>
+        <property name='Tracks' type='ao' access='read'/>
+        <property name='CanEditTracks' type='b' access='read'/>
+    </interface>
 </node>
 """
 
 
+# Window state keys, see CineWindow's state-changed, and the properties they affect
+STATE_PROPS = {
+    "pause": ("PlaybackStatus",),
+    "volume": ("Volume",),
+    "media-title": ("Metadata",),
+    "duration": ("Metadata",),
+    "loop": ("LoopStatus",),
+    "nav": ("CanGoNext", "CanGoPrevious"),
+    "shuffle": ("Shuffle",),
+    "playlist-pos": ("Metadata",),
+    "track": ("Metadata",),
+    "artwork": ("Metadata",),
+}
+
+# Above this many added and removed tracks, send TrackListReplaced instead
+REPLACE_THRESHOLD = 10
+
+# Numbers the windows of this process, after the PID in their bus names
+_instances = itertools.count(1)
+
+
 class MPRIS:
-    def __init__(self, app: Gtk.Application) -> None:
-        self._app = app
-        self._bus_name = f"org.mpris.MediaPlayer2.{APP_ID}"
+    """The MPRIS player of one window, on its own D-Bus connection.
+
+    Every window gets the bus name org.mpris.MediaPlayer2.APP_ID.instancePID_N,
+    unique across processes as MPRIS expects. All of them use the same object
+    path, so each one needs a separate connection. The window calls watch() once its observers feed the state,
+    and close() releases the name when the window goes away.
+    """
+
+    def __init__(self, win: Gtk.ApplicationWindow) -> None:
+        self._win = win
+        self._bus_name = (
+            f"org.mpris.MediaPlayer2.{APP_ID}"
+            f".instance{os.getpid()}_{next(_instances)}"
+        )
         self._path = "/org/mpris/MediaPlayer2"
         self._con = None
+        self._owner_id = 0
+        self._registration_ids: list[int] = []
+        self._cancellable = Gio.Cancellable()
 
-        # Track previous states to avoid redundant signal emissions
-        self._last_status = None
-        self._last_title = None
-        self._last_can_next = None
-        self._last_can_prev = None
-        self._last_vol = None
-        self._last_loop = None
-        self._last_shuffle = None
+        # Last values sent, to avoid redundant signal emissions
+        self._last: dict[str, GLib.Variant] = {}
+        self._dirty: set[str] = set()
+        self._flush_id = 0
 
-        Gio.bus_get(Gio.BusType.SESSION, None, self._on_bus_acquired)
+        self._tracks = TrackList()
+        self._tracks.set_player(win.mpv)  # type: ignore
+        # Track ids last sent, None until the list is sent whole
+        self._published: list[str] | None = None
+        self._tracks_dirty = False
 
-        # Periodically check for player state changes to update the OS UI
-        GLib.timeout_add(500, self._sync_player_state)
-        self._app.connect("notify::active-window", self._update_props)
+        self._state_handler_id = 0
 
-    def _on_bus_acquired(self, _source, res):
+        # Finding the address can mean autolaunching a bus, keep it off the main loop
+        threading.Thread(target=self._find_bus, daemon=True).start()
+
+    def _find_bus(self):
         try:
-            self._con = Gio.bus_get_finish(res)
-            Gio.bus_own_name_on_connection(
-                self._con, self._bus_name, Gio.BusNameOwnerFlags.NONE, None, None
+            address = Gio.dbus_address_get_for_bus_sync(
+                Gio.BusType.SESSION, self._cancellable
+            )
+        except GLib.Error as e:
+            # No session bus, this window runs without MPRIS
+            if not self._cancellable.is_cancelled():
+                print(f"MPRIS Bus Error: {e}")
+            return
+
+        GLib.idle_add(self._connect, address)
+
+    def _connect(self, address):
+        if not self._cancellable.is_cancelled():
+            Gio.DBusConnection.new_for_address(
+                address,
+                Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT
+                | Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+                None,
+                self._cancellable,
+                self._on_bus_acquired,
             )
+        return GLib.SOURCE_REMOVE
+
+    def watch(self):
+        """Follow the window's state, once its mpv observers are set up."""
+        # Changes come from the window's mpv observers, no polling
+        self._state_handler_id = self._win.connect(
+            "state-changed", self._on_state_changed
+        )
+
+    def _on_bus_acquired(self, _source, res):
+        try:
+            self._con = Gio.DBusConnection.new_for_address_finish(res)
 
             node_info = Gio.DBusNodeInfo.new_for_xml(INTERFACE)
             for interface in node_info.interfaces:
-                self._con.register_object(
-                    object_path=self._path,
-                    interface_info=interface,
-                    method_call_closure=self._on_method_call,
-                    get_property_closure=self._on_get_property,
-                    set_property_closure=self._on_set_property,
+                self._registration_ids.append(
+                    self._con.register_object(
+                        object_path=self._path,
+                        interface_info=interface,
+                        method_call_closure=self._on_method_call,
+                        get_property_closure=self._on_get_property,
+                        set_property_closure=self._on_set_property,
+                    )
                 )
+
+            # Owned after the objects exist, so clients find them right away
+            # Not queued behind another owner, where clients would never see it
+            self._owner_id = Gio.bus_own_name_on_connection(
+                self._con,
+                self._bus_name,
+                Gio.BusNameOwnerFlags.DO_NOT_QUEUE,
+                None,
+                self._on_name_lost,
+            )
         except Exception as e:
-            print(f"MPRIS Bus Error: {e}")
+            if not self._cancellable.is_cancelled():
+                print(f"MPRIS Bus Error: {e}")
+
+    def _on_name_lost(self, _con, name):
+        if not self._cancellable.is_cancelled():
+            print(f"MPRIS Bus Error: {name} is owned elsewhere or the bus is gone")
+
+    def close(self):
+        """Drop the bus name and objects, the window is gone."""
+        self._cancellable.cancel()
+        if self._state_handler_id:
+            self._win.disconnect(self._state_handler_id)
+            self._state_handler_id = 0
+        if self._flush_id:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = 0
+
+        if self._owner_id:
+            Gio.bus_unown_name(self._owner_id)
+            self._owner_id = 0
+        if self._con:
+            for registration_id in self._registration_ids:
+                self._con.unregister_object(registration_id)
+            self._registration_ids.clear()
+            self._con.close(None, None)
+            self._con = None
 
     def emit_properties_changed(self, interface, changed_properties):
         if not self._con:
@@ -135,60 +270,109 @@ class MPRIS:
             GLib.Variant("(sa{sv}as)", (interface, changed_properties, [])),
         )
 
-    def _update_props(self, *args):
-        """Notifies D-Bus that properties have changed when the window switches."""
-        if not self._con:
+    def _on_state_changed(self, _win, key):
+        if key == "playlist":
+            self._tracks.invalidate()
+        if key in ("playlist", "playlist-pos"):
+            self._tracks_dirty = True
+        self._queue_props(STATE_PROPS.get(key, ()))
+
+    def _queue_props(self, props):
+        self._dirty.update(props)
+        if (self._dirty or self._tracks_dirty) and not self._flush_id:
+            self._flush_id = GLib.idle_add(self._flush)
+
+    def _flush(self):
+        """Emit everything that changed since the last flush as one signal."""
+        self._flush_id = 0
+        dirty, self._dirty = self._dirty, set()
+        if not self._con or not self.player:
+            return GLib.SOURCE_REMOVE
+
+        changed = {}
+        for prop in dirty:
+            value = self._get_player_property(prop)
+            last = self._last.get(prop)
+            if value is not None and (last is None or not value.equal(last)):
+                changed[prop] = self._last[prop] = value
+
+        if changed:
+            self.emit_properties_changed("org.mpris.MediaPlayer2.Player", changed)
+
+        if self._tracks_dirty:
+            self._tracks_dirty = False
+            self._emit_track_changes()
+
+        return GLib.SOURCE_REMOVE
+
+    def _emit_track_changes(self):
+        """Send how the published tracks changed, as few signals as possible."""
+        state = self.state
+        start, tracks = self._tracks.tracks(state.playlist_pos, state.playlist_count)
+        old, self._published = self._published, tracks
+        if old == tracks:
             return
 
-        self.emit_properties_changed(
-            "org.mpris.MediaPlayer2",
-            {
-                "Identity": GLib.Variant("s", _("Cine")),
-                "DesktopEntry": GLib.Variant("s", APP_ID),
-            },
+        if old is not None:
+            old_set, new_set = set(old), set(tracks)
+            removed = [track for track in old if track not in new_set]
+            added = [i for i, track in enumerate(tracks) if track not in old_set]
+            same_order = [t for t in old if t in new_set] == [
+                t for t in tracks if t in old_set
+            ]
+
+            if same_order and len(removed) + len(added) <= REPLACE_THRESHOLD:
+                for track in removed:
+                    self._emit_track_signal("TrackRemoved", "(o)", (track,))
+                for i in added:
+                    after = tracks[i - 1] if i else NO_TRACK
+                    metadata = self._tracks.metadata(start + i)
+                    self._emit_track_signal(
+                        "TrackAdded", "(a{sv}o)", (metadata, after)
+                    )
+                return
+
+        current = self._tracks.track_id(state.playlist_pos)
+        self._emit_track_signal("TrackListReplaced", "(aoo)", (tracks, current))
+
+    def _emit_track_signal(self, name, signature, args):
+        self._con.emit_signal(
+            None,
+            self._path,
+            "org.mpris.MediaPlayer2.TrackList",
+            name,
+            GLib.Variant(signature, args),
         )
 
-        if self.player:
-            status = "Paused" if self.player.pause else "Playing"
-            title = getattr(self.player, "media_title") or _("Unknown title")
-            loop = self._get_loop_status()
-
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {
-                    "PlaybackStatus": GLib.Variant("s", status),
-                    "LoopStatus": GLib.Variant("s", loop),
-                    "Metadata": self._get_metadata_variant(title),
-                    "CanPlay": GLib.Variant("b", True),
-                    "CanPause": GLib.Variant("b", True),
-                    "CanSeek": GLib.Variant("b", True),
-                    "CanControl": GLib.Variant("b", True),
-                },
-            )
-
     @property
     def player(self):
-        win = self._app.props.active_window
-        return getattr(win, "mpv", None) if win else None
+        return getattr(self._win, "mpv", None)
 
     @property
     def can_go_prev(self):
-        win = self._app.props.active_window
-        return getattr(win, "can_go_prev", False) if win else False
+        return getattr(self._win, "can_go_prev", False)
 
     @property
     def can_go_next(self):
-        win = self._app.props.active_window
-        return getattr(win, "can_go_next", False) if win else False
+        return getattr(self._win, "can_go_next", False)
+
+    @property
+    def shuffle(self):
+        engine = getattr(self._win, "shuffle", None)
+        return engine.enabled if engine else False
+
+    @property
+    def state(self):
+        return getattr(self._win, "state", None)
 
     def _get_loop_status(self):
-        p = self.player
-        if not p:
+        state = self.state
+        if not state:
             return "None"
 
         # mpv loop-playlist can be 'inf', 'no', or a number
-        loop_playlist = getattr(p, "loop_playlist", "inf")
-        loop_file = getattr(p, "loop_file", "inf")
+        loop_playlist = state.loop_playlist
+        loop_file = state.loop_file
 
         if loop_file == "inf":
             return "Track"
@@ -196,131 +380,93 @@ class MPRIS:
             return "Playlist"
         return "None"
 
-    def _sync_player_state(self):
-        """Checks if mpv state changed and notifies D-Bus."""
-        p = self.player
-        if not p or not self._con:
-            return True
-
-        current_status = "Paused" if p.pause else "Playing"
-        if current_status != self._last_status:
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {"PlaybackStatus": GLib.Variant("s", current_status)},
-            )
-            self._last_status = current_status
-
-        current_vol = getattr(p, "volume", 0) / 100.0
-        if self._last_vol is None or abs(current_vol - self._last_vol) > 0.01:
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {"Volume": GLib.Variant("d", float(current_vol))},
-            )
-            self._last_vol = current_vol
-
-        current_title = getattr(p, "media_title") or _("Unknown title")
-        if current_title != self._last_title:
-            metadata = self._get_metadata_variant(current_title)
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player", {"Metadata": metadata}
-            )
-            self._last_title = current_title
-
-        current_loop = self._get_loop_status()
-        if current_loop != self._last_loop:
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {"LoopStatus": GLib.Variant("s", current_loop)},
-            )
-            self._last_loop = current_loop
-
-        can_next = self.can_go_next
-        if can_next != self._last_can_next:
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {"CanGoNext": GLib.Variant("b", can_next)},
-            )
-            self._last_can_next = can_next
-
-        can_prev = self.can_go_prev
-        if can_prev != self._last_can_prev:
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {"CanGoPrevious": GLib.Variant("b", can_prev)},
-            )
-            self._last_can_prev = can_prev
-
-        current_shuffle = getattr(p, "_shuffle", False)
-        if current_shuffle != self._last_shuffle:
-            self.emit_properties_changed(
-                "org.mpris.MediaPlayer2.Player",
-                {"Shuffle": GLib.Variant("b", current_shuffle)},
-            )
-            self._last_shuffle = current_shuffle
-
-        return True
-
     def _get_metadata_variant(self, title):
         """Constructs the MPRIS Metadata dictionary."""
-        p = self.player
-        raw_duration = getattr(p, "duration", 0) or 0
+        state = self.state
+        raw_duration = (state.duration if state else 0) or 0
+
+        # Answer from the cache while mpv is still demuxing
+        if not raw_duration and state:
+            info = metadata_cache.lookup(state.path)
+            raw_duration = info["duration"] if info and info["duration"] else 0
         duration = int(raw_duration * 1_000_000)
 
+        # From the state, Metadata is read often and must not page in entries
+        track = NO_TRACK
+        if state and (state.playlist_pos or 0) >= 0:
+            track = track_path(state.playlist_entry_id)
         metadata = {
-            "mpris:trackid": GLib.Variant("o", "/org/mpris/MediaPlayer2/Track/0"),
+            "mpris:trackid": GLib.Variant("o", track),
             "xesam:title": GLib.Variant("s", str(title)),
             "mpris:length": GLib.Variant("x", duration),
         }
+        if state and state.art_url:
+            metadata["mpris:artUrl"] = GLib.Variant("s", state.art_url)
 
         return GLib.Variant("a{sv}", metadata)
 
     def _on_method_call(
         self, _con, _sender, _path, interface, method, params, invocation
     ):
+        if method == "GetTracksMetadata":
+            invocation.return_value(self._get_tracks_metadata(params.unpack()[0]))
+            return
+
         GLib.idle_add(self._handle_method, method, params)
         invocation.return_value(None)
 
+    def _get_tracks_metadata(self, track_ids):
+        state = self.state
+        if state:
+            # Loads the published pages again if the playlist changed
+            self._tracks.tracks(state.playlist_pos, state.playlist_count)
+
+        metadata = []
+        for track in track_ids:
+            index = self._tracks.find(track)
+            if index is not None:
+                metadata.append(self._tracks.metadata(index))
+        return GLib.Variant("(aa{sv})", (metadata,))
+
     def _handle_method(self, method, params):
         p = self.player
         if not p:
             return
 
         if method == "PlayPause":
-            p.pause = not p.pause
+            p.pause = not self.state.pause
         elif method == "Pause":
             p.pause = True
         elif method == "Play":
             p.pause = False
         elif method == "Previous":
-            win = self._app.props.active_window
-            if win:
-                win._on_previous_clicked(win)  # type: ignore
+            self._win._on_previous_clicked(self._win)  # type: ignore
         elif method == "Next":
-            win = self._app.props.active_window
-            if win:
-                win._on_next_clicked(win)  # type: ignore
+            self._win._on_next_clicked(self._win)  # type: ignore
         elif method == "Stop":
             p.stop()
         elif method == "Seek":
             offset_usec = params.get_child_value(0).get_int64()
-            current_pos = getattr(p, "time_pos", 0) or 0
-            p.time_pos = current_pos + (offset_usec / 1_000_000.0)
-            self._emit_seeked()
+            target = max(0, self.state.position() + (offset_usec / 1_000_000.0))
+            p.time_pos = target
+            self._emit_seeked(target)
         elif method == "SetPosition":
-            pos_usec = params.get_child_value(1).get_int64()
-            p.time_pos = pos_usec / 1_000_000.0
-            self._emit_seeked()
+            target = params.get_child_value(1).get_int64() / 1_000_000.0
+            p.time_pos = target
+            self._emit_seeked(target)
+        elif method == "GoTo":
+            index = self._tracks.find(params.unpack()[0])
+            if index is not None:
+                p.playlist_pos = index
         elif method == "Raise":
-            win = self._app.props.active_window
-            if win:
-                win.present()
+            self._win.present()
         elif method == "Quit":
-            self._app.quit()
+            # Each window is its own player
+            self._win.close()
 
-    def _emit_seeked(self):
+    def _emit_seeked(self, raw_pos):
         if not self._con or not self.player:
             return
-        raw_pos = getattr(self.player, "time_pos", 0) or 0
         pos_usec = int(raw_pos * 1_000_000)
         self._con.emit_signal(
             None,
@@ -331,33 +477,20 @@ class MPRIS:
         )
 
     def _on_get_property(self, _con, _sender, _path, interface, prop):
-        p = self.player
-
         if interface == "org.mpris.MediaPlayer2.Player":
-            if prop == "CanGoPrevious":
-                return GLib.Variant("b", self.can_go_prev)
-            if prop == "CanGoNext":
-                return GLib.Variant("b", self.can_go_next)
-            if prop in ["CanPlay", "CanPause", "CanControl"]:
-                return GLib.Variant("b", True)
-            if prop == "Volume":
-                vol = getattr(p, "volume", 0) / 100.0 if p else 0.0
-                return GLib.Variant("d", float(vol))
-            if prop == "PlaybackStatus":
-                status = "Paused" if (p and p.pause) else "Playing"
-                return GLib.Variant("s", status)
-            if prop == "LoopStatus":
-                return GLib.Variant("s", self._get_loop_status())
-            if prop == "Position":
-                raw_pos = getattr(p, "time_pos", 0) or 0
-                pos = int(raw_pos * 1_000_000)
-                return GLib.Variant("x", pos)
-            if prop == "Metadata":
-                title = getattr(p, "media_title") or _("Unknown title")
-                return self._get_metadata_variant(title)
-            if prop == "Shuffle":
-                _shuffle = getattr(p, "_shuffle", False) if p else False
-                return GLib.Variant("b", _shuffle)
+            return self._get_player_property(prop)
+
+        if interface == "org.mpris.MediaPlayer2.TrackList":
+            if prop == "Tracks":
+                tracks = self._published
+                if tracks is None and self.state:
+                    state = self.state
+                    _start, tracks = self._tracks.tracks(
+                        state.playlist_pos, state.playlist_count
+                    )
+                return GLib.Variant("ao", tracks or [])
+            if prop == "CanEditTracks":
+                return GLib.Variant("b", False)
 
         if interface == "org.mpris.MediaPlayer2":
             if prop == "Identity":
@@ -367,12 +500,42 @@ class MPRIS:
             if prop in ["CanQuit", "CanRaise"]:
                 return GLib.Variant("b", True)
             if prop == "HasTrackList":
-                return GLib.Variant("b", False)
+                return GLib.Variant("b", True)
             if prop in ["SupportedUriSchemes", "SupportedMimeTypes"]:
                 return GLib.Variant("as", [])
 
         return None
 
+    def _get_player_property(self, prop):
+        """Answer from the window's PlayerState, it never waits on mpv."""
+        state = self.state
+
+        if prop == "CanGoPrevious":
+            return GLib.Variant("b", self.can_go_prev)
+        if prop == "CanGoNext":
+            return GLib.Variant("b", self.can_go_next)
+        if prop in ["CanPlay", "CanPause", "CanControl", "CanSeek"]:
+            return GLib.Variant("b", True)
+        if prop == "Volume":
+            vol = (state.volume or 0) / 100.0 if state else 0.0
+            return GLib.Variant("d", float(vol))
+        if prop == "PlaybackStatus":
+            status = "Paused" if (state and state.pause) else "Playing"
+            return GLib.Variant("s", status)
+        if prop == "LoopStatus":
+            return GLib.Variant("s", self._get_loop_status())
+        if prop == "Position":
+            raw_pos = state.position() if state else 0
+            pos = int(raw_pos * 1_000_000)
+            return GLib.Variant("x", pos)
+        if prop == "Metadata":
+            title = (state.media_title if state else None) or _("Unknown title")
+            return self._get_metadata_variant(title)
+        if prop == "Shuffle":
+            return GLib.Variant("b", self.shuffle)
+
+        return None
+
     def _on_set_property(self, _con, _sender, _path, interface, prop, value):
         p = self.player
         if not p:
@@ -380,12 +543,7 @@ class MPRIS:
 
         if interface == "org.mpris.MediaPlayer2.Player":
             if prop == "Volume":
-                new_vol = value.get_double()
-                p.volume = new_vol * 100.0
-                self.emit_properties_changed(
-                    "org.mpris.MediaPlayer2.Player",
-                    {"Volume": GLib.Variant("d", float(new_vol))},
-                )
+                p.volume = value.get_double() * 100.0
                 return True
 
             if prop == "LoopStatus":
@@ -400,24 +558,11 @@ class MPRIS:
                 elif new_loop == "Playlist":
                     p.loop_file = "no"
                     p.loop_playlist = "inf"
-
-                self.emit_properties_changed(
-                    "org.mpris.MediaPlayer2.Player",
-                    {"LoopStatus": GLib.Variant("s", new_loop)},
-                )
                 return True
 
             if prop == "Shuffle":
-                new_shuffle = value.get_boolean()
-                p._shuffle = new_shuffle
-                win = self._app.props.active_window
-                if win:
-                    btn = win.playlist_shuffle_toggle_button  # type: ignore
-                    btn.props.active = new_shuffle
-                self.emit_properties_changed(
-                    "org.mpris.MediaPlayer2.Player",
-                    {"Shuffle": GLib.Variant("b", new_shuffle)},
-                )
+                btn = self._win.playlist_shuffle_toggle_button  # type: ignore
+                btn.props.active = value.get_boolean()
                 return True
 
         return False
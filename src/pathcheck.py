@@ -0,0 +1,122 @@
+# pathcheck.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import time
+import weakref
+import threading
+from collections import deque
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+WORKERS = 2
+# Oldest requests are dropped first, those rows were likely scrolled away
+QUEUE_SIZE = 128
+CACHE_TTL = 30
+
+FILE = "file"
+DIR = "dir"
+EMPTY_DIR = "empty-dir"
+
+
+def _classify(path):
+    try:
+        with os.scandir(path) as entries:
+            return DIR if next(entries, None) else EMPTY_DIR
+    except NotADirectoryError:
+        return FILE
+    except OSError:
+        # Missing or unreadable, mpv reports the error when played
+        return FILE
+
+
+class PathChecker:
+    """Classify playlist paths as file, folder or empty folder in worker threads.
+
+    Results are cached by path for CACHE_TTL seconds and delivered to the
+    callback on the main loop. Requests belong to an owner, cancel(owner)
+    drops only that owner's pending ones. A request pushed out of the full
+    queue is answered with None, so the owner can ask again later.
+    """
+
+    def __init__(self):
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._cache: dict[str, tuple[float, str]] = {}
+        self._generations: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._threads: list[threading.Thread] = []
+
+    def lookup(self, path):
+        """Return the cached kind of path, or None if unknown or expired."""
+        if not path or "://" in path:
+            return FILE
+
+        cached = self._cache.get(path)
+        if cached and time.monotonic() - cached[0] < CACHE_TTL:
+            return cached[1]
+        return None
+
+    def request(self, owner, path, callback, *args):
+        """Queue a check, callback(kind, *args) runs on the main loop."""
+        with self._cond:
+            generation = self._generations.setdefault(owner, 0)
+            self._queue.append((owner, generation, path, callback, args))
+            dropped = (
+                self._queue.popleft() if len(self._queue) > QUEUE_SIZE else None
+            )
+            self._cond.notify()
+
+        if dropped:
+            owner, generation, path, callback, args = dropped
+            GLib.idle_add(self._deliver, owner, generation, path, None, callback, args)
+
+        if len(self._threads) < WORKERS:
+            thread = threading.Thread(target=self._work, daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def cancel(self, owner):
+        """Forget the pending requests of owner, no callbacks follow."""
+        with self._cond:
+            if owner not in self._generations:
+                return
+            self._generations[owner] += 1
+            self._queue = deque(job for job in self._queue if job[0] is not owner)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                owner, generation, path, callback, args = self._queue.popleft()
+
+            kind = _classify(path)
+            GLib.idle_add(self._deliver, owner, generation, path, kind, callback, args)
+
+    def _deliver(self, owner, generation, path, kind, callback, args):
+        if kind:
+            self._cache[path] = (time.monotonic(), kind)
+        if self._generations.get(owner) == generation:
+            callback(kind, *args)
+        return GLib.SOURCE_REMOVE
+
+
+path_checker = PathChecker()
@@ -0,0 +1,195 @@
+# player.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import mpv
+import threading
+from gettext import gettext as _
+
+from .events import MpvEventSource
+from .preferences import settings
+from .shortcuts import INTERNAL_BINDINGS
+from .utils import SCREENSHOT_DIR, CONFIG_DIR, INPUT_CONF
+
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+
+def create_player():
+    """Create an mpv core with Cine's options, mpv.conf, scripts and bindings.
+
+    Its events are handled on the main loop, see MpvEventSource.
+    """
+    player = mpv.MPV(
+        start_event_thread=False,
+        # terminal=True,
+        # log_handler=print,
+        loglevel="info",
+        audio_client_name=_("Cine"),
+        screenshot_directory=SCREENSHOT_DIR,
+        screenshot_template="cine_%n",
+        config=True,
+        config_dir=CONFIG_DIR,
+        input_default_bindings=False,
+        input_vo_keyboard=True,
+        load_scripts=True,
+        audio_display="embedded-first",
+        audio_file_auto="fuzzy",
+        sub_auto="fuzzy",
+        sub_file_paths="sub:subs:subtitles:Sub:Subs:Subtitles:srt:srts:Srt:Srts",
+        sub_border_size=2,
+        sub_shadow_offset=0.6,
+        sub_border_color="#B6000000",
+        sub_shadow_color="#97000000",
+        sub_color="#ebebeb",
+        sub_use_margins=False,
+        sub_font="Adwaita Sans SemiBold",
+        osd_font="Adwaita Sans",
+        osd_bold=True,
+        osd_bar=False,
+        osd_blur=1,
+        osd_border_size=1.5,
+        osd_shadow_offset=0.6,
+        osd_border_color="#BE000000",
+        osd_shadow_color="#1B000000",
+        osd_margin_x=66,
+        osd_margin_y=66,
+        volume_max=150,
+    )
+    player._event_source = MpvEventSource(player)
+
+    player["keep-open"] = "yes"
+    player["keep-open-pause"] = "no"
+    player["vo"] = "libmpv"
+    player["osc"] = "no"
+    player["load-console"] = "no"
+    player.command("change-list", "watch-later-options", "remove", "vid")
+    player.command("change-list", "watch-later-options", "remove", "aid")
+
+    player.command("load-input-conf", f"memory://{INTERNAL_BINDINGS}")
+
+    if os.path.exists(INPUT_CONF):
+        player.command("load-input-conf", INPUT_CONF)
+
+    return player
+
+
+def _listable(path):
+    """Whether path survives as a line of an m3u list."""
+    return (
+        path == path.strip()
+        and not path.startswith("#")
+        and not any(c in path for c in "\r\n")
+    )
+
+
+def enqueue(player, paths, mode="append-play"):
+    """Add paths to the playlist with as few commands as possible, in order.
+
+    mode ("replace", "append" or "append-play") applies to the first command,
+    the following ones append. Consecutive paths go in one in-memory m3u list,
+    those that can't be written in one fall back to loadfile.
+    """
+    then = "append" if mode == "append" else "append-play"
+    batch = []
+
+    def load(command, arg):
+        nonlocal mode
+        command(arg, mode)
+        mode = then
+
+    for path in paths:
+        if not path:
+            continue
+        if _listable(path):
+            batch.append(path)
+            continue
+        if batch:
+            load(player.loadlist, "memory://#EXTM3U\n" + "\n".join(batch))
+            batch.clear()
+        load(player.loadfile, path)
+
+    if batch:
+        load(player.loadlist, "memory://#EXTM3U\n" + "\n".join(batch))
+
+
+def terminate_player(player):
+    """Release the event client first, terminate() waits for it."""
+    player._event_source.destroy()
+    player.terminate()
+
+
+class PlayerPool:
+    """Standby mpv cores, prepared in a thread, for new windows to adopt.
+
+    The pool size comes from the standby-players setting.
+    """
+
+    def __init__(self):
+        self._players: list[mpv.MPV] = []
+        self._filling = False
+        settings.connect("changed::standby-players", self._on_size_changed)
+
+    @property
+    def size(self):
+        return settings.get_int("standby-players")
+
+    def take(self):
+        """Return a ready player or None, and start preparing the next one."""
+        player = self._players.pop(0) if self._players else None
+        self.schedule_fill()
+        return player
+
+    def schedule_fill(self):
+        """Prepare players up to the pool size once the main loop is idle."""
+        if not self._filling and len(self._players) < self.size:
+            self._filling = True
+            GLib.idle_add(self._start_fill, priority=GLib.PRIORITY_LOW)
+
+    def _start_fill(self):
+        threading.Thread(target=self._fill, daemon=True).start()
+
+    def _fill(self):
+        try:
+            player = create_player()
+        except Exception as e:
+            print(f"Standby player error: {e}")
+            player = None
+        GLib.idle_add(self._on_filled, player)
+
+    def _on_filled(self, player):
+        self._filling = False
+        if not player:
+            return
+
+        if len(self._players) < self.size:
+            self._players.append(player)
+            self.schedule_fill()
+        else:
+            terminate_player(player)
+
+    def _on_size_changed(self, _settings, _key):
+        while len(self._players) > self.size:
+            terminate_player(self._players.pop())
+        self.schedule_fill()
+
+    def clear(self):
+        while self._players:
+            terminate_player(self._players.pop())
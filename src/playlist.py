@@ -1,13 +1,16 @@
 import gi
-import os
+
+from .pathcheck import path_checker, DIR, EMPTY_DIR
+from .playlistmodel import PlaylistItem, PlaylistModel
+from .scanner import DropClassifier
 
 gi.require_version("Adw", "1")
-gi.require_version("Gio", "2.0")
 gi.require_version("Gdk", "4.0")
 gi.require_version("GLib", "2.0")
 gi.require_version("Gtk", "4.0")
-from gi.repository import Adw, Gio, Gdk, GLib, Gtk
+from gi.repository import Adw, Gdk, GLib, Gtk
 from gettext import gettext as _
+from typing import cast
 
 
 @Gtk.Template(resource_path="/io/github/diegopvlk/Cine/playlist.ui")
@@ -16,8 +19,8 @@ class Playlist(Adw.Dialog):
 
     toast_overlay: Adw.ToastOverlay = Gtk.Template.Child()
     spinner: Adw.Spinner = Gtk.Template.Child()
-    playlist_clamp: Adw.Clamp = Gtk.Template.Child()
-    playlist_list_box: Gtk.ListBox = Gtk.Template.Child()
+    playlist_clamp: Adw.ClampScrollable = Gtk.Template.Child()
+    playlist_list_view: Gtk.ListView = Gtk.Template.Child()
     drop_indicator_revealer: Gtk.Revealer = Gtk.Template.Child()
 
     def __init__(self, window, **kwargs):
@@ -25,10 +28,18 @@ class Playlist(Adw.Dialog):
         self.win = window
         self.mpv = window.mpv
 
-        parent_height = window.get_height()
-        self.set_content_height(parent_height)
+        self.model = PlaylistModel(self.mpv)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_setup_row)
+        factory.connect("bind", self._on_bind_row)
+        factory.connect("unbind", self._on_unbind_row)
+        self.playlist_list_view.set_factory(factory)
+        self.playlist_list_view.set_model(Gtk.NoSelection(model=self.model))
+        self.scroll_pending = False
+        self.state_handler_id = 0
 
-        self._populate_list()
+        self.connect("map", self._on_map)
+        self.connect("unmap", self._on_unmap)
 
         drop_target = Gtk.DropTarget.new(Gdk.FileList, Gdk.DragAction.COPY)
         drop_target.connect("enter", self._on_drop_enter)
@@ -58,86 +69,115 @@ class Playlist(Adw.Dialog):
         GLib.timeout_add(10, self.drop_indicator_revealer.set_reveal_child, False)
 
     def _on_drop(self, _target, list: Gdk.FileList, _x, _y):
-        for file in list.get_files():
-            info = file.query_info(
-                "standard::content-type,standard::type",
-                Gio.FileQueryInfoFlags.NONE,
-                None,
-            )
-
-            path = file.get_path() or file.get_uri()
-            file_type = info.get_file_type()
-            mime_type = info.get_content_type() or ""
-
-            if file_type == Gio.FileType.DIRECTORY:
-                self.mpv.loadfile(path, "append-play")
-                continue
-
-            valid_types = ("video/", "audio/", "image/")
-            if mime_type.startswith(valid_types):
-                self.mpv.loadfile(path, "append-play")
-
-        GLib.idle_add(
-            lambda *a: self.win._on_shuffle_toggled(
-                self.win.playlist_shuffle_toggle_button
-            )
+        DropClassifier(
+            list.get_files(), self.win.cancellable, self._on_drop_classified
         )
+        return True
 
-        self._populate_list()
-        self.spinner.set_visible(False)
-
-    def _populate_list(self):
-        self.playlist_list_box.remove_all()
-        playlist = self.mpv.playlist
-
-        for index, item in enumerate(playlist):
-            path = item.get("filename", "")
-            subtitle = item.get("title") or os.path.basename(path)
-            parent_dir = os.path.basename(os.path.dirname(path))
-            title = parent_dir if parent_dir else path
-
-            row = Adw.ActionRow(title=title, subtitle=subtitle)
-            row.add_css_class("property")
-            row.set_activatable(True)
+    def _on_drop_classified(self, results):
+        # Subtitles are only loaded when dropped on the video
+        paths = [path for path, kind in results if kind in ("media", "folder")]
+        has_folders = any(kind == "folder" for _path, kind in results)
 
-            icon_name = "applications-multimedia-symbolic"
+        if paths:
+            self.win.add_paths(paths, scan=has_folders)
 
-            if os.path.isdir(path):
-                icon_name = "folder-symbolic"
-                if not os.listdir(path):
-                    row.set_sensitive(False)
+        self.spinner.set_visible(False)
 
-            row.set_icon_name(icon_name)
-            row.connect("activated", self._on_file_activated, index)
-            self.playlist_list_box.append(row)
+    def present_for(self, window):
+        """Show the dialog again, it's kept by the window between opens."""
+        self.set_content_height(window.get_height())
+        self.present(window)
 
-        GLib.idle_add(self._scroll_to_playing)
+    def _on_map(self, _dialog):
+        self.scroll_pending = True
+        self.state_handler_id = self.win.connect(
+            "state-changed", self._on_state_changed
+        )
+        # Changes made while closed weren't followed
+        self._update_list(reset=True)
+
+    def _on_unmap(self, _dialog):
+        self.win.disconnect(self.state_handler_id)
+        path_checker.cancel(self)
+
+    def _on_state_changed(self, _win, key):
+        # The window tells playlist-count changes, reorders and replaces
+        if key == "playlist":
+            self._update_list()
+
+    def _update_list(self, reset=False):
+        self.model.update(self.win.state.playlist_count, reset)
+        if self.scroll_pending:
+            self.scroll_pending = False
+            self._scroll_to_playing()
+        else:
+            self.model.set_current(self.win.state.playlist_pos)
 
     def _scroll_to_playing(self):
-        if hasattr(self, "curr_playing_row") and self.curr_playing_row:
-            self.curr_playing_row.remove_css_class("playing-item-playlist")
-
-        if not hasattr(self, "playing_icon") or not self.playing_icon:
-            self.playing_icon = Gtk.Image.new_from_icon_name(
-                "media-playback-start-symbolic"
+        self.model.set_current(self.win.state.playlist_pos)
+        if 0 <= self.model.current < self.model.get_n_items():
+            self.playlist_list_view.scroll_to(
+                self.model.current, Gtk.ListScrollFlags.FOCUS, None
             )
 
-        parent = self.playing_icon.get_parent()
-        if isinstance(parent, (Gtk.Box, Adw.ActionRow)):
-            parent.remove(self.playing_icon)
-
-        current_pos = self.mpv.playlist_pos
-        new_row = self.playlist_list_box.get_row_at_index(current_pos)
-
-        if isinstance(new_row, (Gtk.Box, Adw.ActionRow)):
-            new_row.grab_focus()
-            new_row.add_css_class("playing-item-playlist")
-            new_row.add_suffix(self.playing_icon)
+    def _on_setup_row(self, _factory, list_item: Gtk.ListItem):
+        row = Adw.ActionRow()
+        row.add_css_class("property")
+        row.playing_icon = Gtk.Image.new_from_icon_name(
+            "media-playback-start-symbolic"
+        )
+        row.add_suffix(row.playing_icon)
+        list_item.set_child(row)
+
+    def _on_bind_row(self, _factory, list_item: Gtk.ListItem):
+        row = cast(Adw.ActionRow, list_item.get_child())
+        item = cast(PlaylistItem, list_item.get_item())
+
+        row.set_title(GLib.markup_escape_text(item.title))
+        row.set_subtitle(GLib.markup_escape_text(item.subtitle))
+
+        if not item.kind:
+            if kind := path_checker.lookup(item.filename):
+                item.kind = kind
+            else:
+                path_checker.request(
+                    self, item.filename, self._on_path_checked, item
+                )
+
+        self._sync_row(item, None, row, list_item)
+        row.notify_id = item.connect("notify", self._sync_row, row, list_item)
+
+    def _on_unbind_row(self, _factory, list_item: Gtk.ListItem):
+        row = list_item.get_child()
+        item = list_item.get_item()
+        if item and getattr(row, "notify_id", 0):
+            item.disconnect(row.notify_id)
+            row.notify_id = 0
+
+    def _on_path_checked(self, kind, item):
+        # None when the check was dropped, the row asks again when bound
+        if kind:
+            item.kind = kind
+
+    def _sync_row(self, item, _pspec, row, list_item):
+        is_dir = item.kind in (DIR, EMPTY_DIR)
+        row.set_icon_name(
+            "folder-symbolic" if is_dir else "applications-multimedia-symbolic"
+        )
+        sensitive = item.kind != EMPTY_DIR
+        row.set_sensitive(sensitive)
+        list_item.set_activatable(sensitive)
 
-            self.curr_playing_row = new_row
+        row.playing_icon.set_visible(item.playing)
+        if item.playing:
+            row.add_css_class("playing-item-playlist")
+        else:
+            row.remove_css_class("playing-item-playlist")
 
-    def _on_file_activated(self, _row, index):
-        self.mpv.playlist_pos = index
+    @Gtk.Template.Callback()
+    def _on_item_activated(self, _list_view, position):
+        self.mpv.playlist_pos = position
         self.mpv.pause = False
         self.close()
 
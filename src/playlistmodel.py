@@ -0,0 +1,139 @@
+# playlistmodel.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+
+from .metadata import metadata_cache
+
+gi.require_version("Gio", "2.0")
+gi.require_version("GObject", "2.0")
+from gi.repository import Gio, GObject
+
+
+class PlaylistItem(GObject.Object):
+    """A playlist entry, its properties are read from mpv when first created."""
+
+    __gtype_name__ = "CinePlaylistItem"
+
+    playing = GObject.Property(type=bool, default=False)
+    # "file", "dir" or "empty-dir" once checked, see PathChecker
+    kind = GObject.Property(type=str, default="")
+
+    def __init__(self, filename, mpv_title=None):
+        super().__init__()
+        self.filename: str = filename or ""
+
+        info = None if mpv_title else metadata_cache.lookup(self.filename)
+        cached_title = info["title"] if info else None
+        parent_dir = os.path.basename(os.path.dirname(self.filename))
+
+        self.title: str = parent_dir if parent_dir else self.filename
+        self.subtitle: str = (
+            mpv_title or cached_title or os.path.basename(self.filename)
+        )
+
+
+class PlaylistModel(GObject.Object, Gio.ListModel):
+    """mpv's playlist as a Gio.ListModel.
+
+    It's kept in sync with update() from playlist-count, items are read
+    from playlist/N/... on request, so a list view only fetches the rows
+    it shows.
+    """
+
+    __gtype_name__ = "CinePlaylistModel"
+
+    def __init__(self, player):
+        super().__init__()
+        self._mpv = player
+        self._items: list[PlaylistItem | None] = []
+        # Id of the last entry, to tell appends from other changes
+        self._tail = None
+        self._current = -1
+
+    def do_get_item_type(self):
+        return PlaylistItem.__gtype__
+
+    def do_get_n_items(self):
+        return len(self._items)
+
+    def do_get_item(self, position):
+        if not 0 <= position < len(self._items):
+            return None
+
+        item = self._items[position]
+        if item is None:
+            item = self._load(position)
+            self._items[position] = item
+        return item
+
+    def _get(self, name):
+        try:
+            return self._mpv[name]
+        except Exception:
+            # Titles are missing unless the playlist file had one
+            return None
+
+    def _load(self, position):
+        item = PlaylistItem(
+            self._get(f"playlist/{position}/filename"),
+            self._get(f"playlist/{position}/title"),
+        )
+        item.playing = position == self._current
+        return item
+
+    def update(self, count, reset=False):
+        """Follow mpv's playlist-count with one splice.
+
+        If the entry that was last is still in place, the new entries were
+        appended and only their rows are added, even in a large playlist.
+        Any other change, or reset, replaces every row, which a list view
+        pays for only on the rows it shows.
+        """
+        count = count or 0
+        old = len(self._items)
+        appended = count > old and (
+            not old or self._get(f"playlist/{old - 1}/id") == self._tail
+        )
+
+        if appended and not reset:
+            self._items.extend([None] * (count - old))
+            self.items_changed(old, 0, count - old)
+        elif old or count:
+            self._items = [None] * count
+            self.items_changed(0, old, count)
+
+        self._tail = self._get(f"playlist/{count - 1}/id") if count else None
+
+    def set_current(self, position):
+        """Move the playing marker, only the two affected items change."""
+        if position is None:
+            position = -1
+        if position == self._current:
+            return
+
+        for index, playing in ((self._current, False), (position, True)):
+            if 0 <= index < len(self._items) and (item := self._items[index]):
+                item.playing = playing
+        self._current = position
+
+    @property
+    def current(self):
+        return self._current
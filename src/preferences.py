@@ -31,6 +31,9 @@ def sync_mpv_with_settings(window):
     if norm_enabled:
         player.command("af", "add", "@cine_loudnorm:lavfi=[loudnorm=I=-20]")
 
+    if settings.get_boolean("display-sync"):
+        player["video-sync"] = "display-resample"
+
 
 @Gtk.Template(resource_path="/io/github/diegopvlk/Cine/preferences.ui")
 class Preferences(Adw.Dialog):
@@ -48,6 +51,10 @@ class Preferences(Adw.Dialog):
     audio_lang_row: Adw.EntryRow = Gtk.Template.Child()
     hwdec_row: Adw.SwitchRow = Gtk.Template.Child()
     normalize_volume_row: Adw.SwitchRow = Gtk.Template.Child()
+    display_sync_row: Adw.SwitchRow = Gtk.Template.Child()
+    folder_depth_row: Adw.SpinRow = Gtk.Template.Child()
+    background_audio_row: Adw.SwitchRow = Gtk.Template.Child()
+    standby_players_row: Adw.SpinRow = Gtk.Template.Child()
     save_position_switch: Gtk.Switch = Gtk.Template.Child()
 
     def __init__(self, active_window, **kwargs):
@@ -115,6 +122,30 @@ class Preferences(Adw.Dialog):
             "active",
             Gio.SettingsBindFlags.DEFAULT,
         )
+        settings.bind(
+            "display-sync",
+            self.display_sync_row,
+            "active",
+            Gio.SettingsBindFlags.DEFAULT,
+        )
+        settings.bind(
+            "folder-depth",
+            self.folder_depth_row,
+            "value",
+            Gio.SettingsBindFlags.DEFAULT,
+        )
+        settings.bind(
+            "background-audio-only",
+            self.background_audio_row,
+            "active",
+            Gio.SettingsBindFlags.DEFAULT,
+        )
+        settings.bind(
+            "standby-players",
+            self.standby_players_row,
+            "value",
+            Gio.SettingsBindFlags.DEFAULT,
+        )
         settings.bind(
             "save-video-position",
             self.save_position_switch,
@@ -131,6 +162,7 @@ class Preferences(Adw.Dialog):
             "audio-languages": self._on_alang_changed,
             "hwdec": self._on_hwdec_changed,
             "normalize-volume": self._on_norm_volume_changed,
+            "display-sync": self._on_display_sync_changed,
             "save-video-position": self._on_save_pos_changed,
         }
 
@@ -179,6 +211,12 @@ class Preferences(Adw.Dialog):
         else:
             self.player.command("af", "remove", "@cine_loudnorm")
 
+    def _on_display_sync_changed(self, settings, _key):
+        if settings.get_boolean("display-sync"):
+            self.player["video-sync"] = "display-resample"
+        else:
+            self.player["video-sync"] = self.win.conf_video_sync
+
     def _on_color_selected(self, color_btn, *arg):
         rgba = color_btn.get_rgba()
         hex_color = "#{:02x}{:02x}{:02x}".format(
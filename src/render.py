@@ -0,0 +1,239 @@
+# render.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import mpv
+import ctypes
+import threading
+
+gi.require_version("Gdk", "4.0")
+gi.require_version("GLib", "2.0")
+gi.require_version("Graphene", "1.0")
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gdk, GLib, Graphene, Gtk
+
+# From libmpv/render.h, python-mpv doesn't know the software renderer params
+RENDER_PARAM_BLOCK_FOR_TARGET_TIME = 12
+RENDER_PARAM_SW_SIZE = 17
+RENDER_PARAM_SW_FORMAT = 18
+RENDER_PARAM_SW_STRIDE = 19
+RENDER_PARAM_SW_POINTER = 20
+
+
+def render_sw(ctx: mpv.MpvRenderContext, width, height, stride, pointer):
+    """Render with an "sw" context as bgr0 into the memory at pointer."""
+    size = (ctypes.c_int * 2)(width, height)
+    fmt = ctypes.c_char_p(b"bgr0")
+    stride_value = ctypes.c_size_t(stride)
+    block = ctypes.c_int(0)
+    values = {
+        RENDER_PARAM_SW_SIZE: size,
+        RENDER_PARAM_SW_FORMAT: fmt,
+        RENDER_PARAM_SW_STRIDE: ctypes.pointer(stride_value),
+        RENDER_PARAM_SW_POINTER: pointer,
+        RENDER_PARAM_BLOCK_FOR_TARGET_TIME: ctypes.pointer(block),
+    }
+
+    # The last one stays zeroed, the invalid param ends the list
+    params = (mpv.MpvRenderParam * (len(values) + 1))()
+    for param, (type_id, value) in zip(params, values.items()):
+        param.type_id = type_id
+        param.data = ctypes.cast(value, ctypes.c_void_p)
+
+    mpv._mpv_render_context_render(ctx.handle, params)
+
+
+class RenderScheduler:
+    """Turn mpv render updates into at most one queue_render per frame.
+
+    mpv_render_context_update runs on the widget's frame clock, so redraws
+    follow the compositor. The contexts don't use advanced control: the main
+    loop makes synchronous mpv calls, which could deadlock against a render.
+    """
+
+    def __init__(self, area: Gtk.Widget):
+        self._area = area
+        self._ctx: mpv.MpvRenderContext | None = None
+        self._lock = threading.Lock()
+        self._pending = False
+        self._tick_id = 0
+        self.suspended = False
+
+        self.updates = 0
+        self.ticks = 0
+        self.renders = 0
+        self.skipped = 0
+
+    def attach(self, ctx: mpv.MpvRenderContext):
+        self._ctx = ctx
+        ctx.update_cb = self._on_update
+
+    def detach(self):
+        if self._ctx:
+            self._ctx.update_cb = None
+            self._ctx = None
+        if self._tick_id:
+            self._area.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
+
+    def suspend(self):
+        """Stop queueing renders, mpv's updates are still consumed."""
+        self.suspended = True
+
+    def resume(self):
+        self.suspended = False
+        # Show the current frame right away
+        if self._ctx:
+            self._area.queue_render()
+
+    def _on_update(self):
+        # Called from mpv threads, must not call into mpv
+        with self._lock:
+            self.updates += 1
+            if self._pending:
+                return
+            self._pending = True
+
+        GLib.idle_add(self._arm, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _arm(self):
+        if self.suspended or not self._area.get_mapped():
+            # No frames while hidden, keep mpv's queue moving anyway
+            self._update()
+        elif not self._tick_id:
+            self._tick_id = self._area.add_tick_callback(self._on_tick)
+        return GLib.SOURCE_REMOVE
+
+    def _on_tick(self, _area, _frame_clock):
+        self.ticks += 1
+        self._update()
+
+        with self._lock:
+            if self._pending:
+                return GLib.SOURCE_CONTINUE
+            self._tick_id = 0
+            return GLib.SOURCE_REMOVE
+
+    def _update(self):
+        with self._lock:
+            self._pending = False
+        if not self._ctx or not self._ctx.update():
+            return
+        if self.suspended:
+            self.skipped += 1
+        elif self._area.get_mapped():
+            self._area.queue_render()
+
+    def render(self, **params):
+        """Render a frame and report the swap, without waiting for its target time."""
+        if not self._ctx:
+            return
+        self._ctx.render(block_for_target_time=False, **params)
+        self._ctx.report_swap()
+        self.renders += 1
+
+    def render_software(self, width, height, stride, pointer):
+        """Render a frame as bgr0 into the memory at pointer."""
+        if not self._ctx:
+            return False
+
+        render_sw(self._ctx, width, height, stride, pointer)
+        self._ctx.report_swap()
+        self.renders += 1
+        return True
+
+    def stats(self):
+        return (
+            f"{self.updates} updates, {self.ticks} ticks, "
+            f"{self.renders} renders, {self.skipped} skipped"
+        )
+
+
+class SoftwareVideo(Gtk.Widget):
+    """Video widget for mpv's software renderer, used when there is no GL.
+
+    Frames are rendered into a buffer kept across frames and shown as
+    Gdk.MemoryTexture. Each texture needs its own GLib.Bytes: GTK won't see
+    new contents in a texture it has, and PyGObject can't make one that
+    borrows the buffer. queue_render() mirrors Gtk.GLArea for RenderScheduler.
+    """
+
+    __gtype_name__ = "CineSoftwareVideo"
+
+    def __init__(self, **kwargs):
+        super().__init__(hexpand=True, vexpand=True, **kwargs)
+        self.scheduler: RenderScheduler | None = None
+        self._buffer = None
+        self._size = (0, 0)
+        self._stride = 0
+        self._texture: Gdk.Texture | None = None
+        self._builder = Gdk.MemoryTextureBuilder()
+        self._builder.set_format(Gdk.MemoryFormat.B8G8R8X8)
+        self._dirty = False
+
+    def queue_render(self):
+        self._dirty = True
+        self.queue_draw()
+
+    def do_size_allocate(self, width, height, baseline):
+        self._dirty = True
+
+    def _ensure_buffer(self, width, height):
+        if self._size == (width, height):
+            return
+        # mpv recommends a stride aligned to 64 bytes
+        self._stride = (width * 4 + 63) & ~63
+        self._buffer = ctypes.create_string_buffer(self._stride * height)
+        self._size = (width, height)
+        self._builder.set_width(width)
+        self._builder.set_height(height)
+        self._builder.set_stride(self._stride)
+
+    def _render(self):
+        scale = self.get_scale_factor()
+        width, height = self.get_width() * scale, self.get_height() * scale
+        if width <= 0 or height <= 0 or not self.scheduler:
+            return
+
+        self._ensure_buffer(width, height)
+        try:
+            if not self.scheduler.render_software(
+                width, height, self._stride, self._buffer
+            ):
+                return
+        except Exception as e:
+            print(f"Render error: {e}")
+            return
+
+        # PyGObject only takes bytes quickly, .raw is one copy of the frame
+        self._builder.set_bytes(GLib.Bytes.new(self._buffer.raw))
+        self._texture = self._builder.build()
+
+    def do_snapshot(self, snapshot):
+        if self._dirty:
+            self._dirty = False
+            self._render()
+
+        rect = Graphene.Rect().init(0, 0, self.get_width(), self.get_height())
+        if self._texture:
+            snapshot.append_texture(self._texture, rect)
+        else:
+            black = Gdk.RGBA()
+            black.parse("black")
+            snapshot.append_color(black, rect)
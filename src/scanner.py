@@ -0,0 +1,236 @@
+# scanner.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+import re
+import time
+import threading
+
+from .utils import MEDIA_EXTS, SUB_EXTS
+
+gi.require_version("Gio", "2.0")
+gi.require_version("GLib", "2.0")
+from gi.repository import Gio, GLib
+
+BATCH_SIZE = 200
+# Send what was found so far at least this often, in seconds
+BATCH_INTERVAL = 0.1
+# Concurrent query_info calls when classifying dropped files
+MAX_QUERIES = 8
+
+MEDIA_TYPES = ("video/", "audio/", "image/")
+
+
+def natural_key(name):
+    """Sort key where "ep2" comes before "ep10"."""
+    # Odd parts are the digit runs, int() takes any decimal digit
+    # but not others like "²" that isdigit() accepts
+    return [
+        int(part) if index % 2 else part.casefold()
+        for index, part in enumerate(re.split(r"(\d+)", name))
+    ]
+
+
+def is_media(name):
+    """Classify by extension, guessing the MIME type from the name otherwise."""
+    ext = os.path.splitext(name)[1].lower()
+    if ext in MEDIA_EXTS:
+        return True
+    if not ext or ext in SUB_EXTS:
+        return False
+
+    content_type, _uncertain = Gio.content_type_guess(name, None)
+    mime = Gio.content_type_get_mime_type(content_type) or ""
+    return mime.startswith(MEDIA_TYPES)
+
+
+class FolderScanner:
+    """Expand folders into media files in a worker thread.
+
+    Roots are handled in order, files among them are passed through.
+    Folders are walked depth first up to max_depth, each level in natural order.
+    Files reach on_batch(paths) on the main loop in batches, while
+    on_progress(found, folders) reports the walk. on_done(found) runs last,
+    unless cancel() was called.
+    """
+
+    def __init__(self, roots, max_depth, on_batch, on_progress, on_done):
+        self._on_batch = on_batch
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._max_depth = max_depth
+        self._cancelled = threading.Event()
+
+        self.found = 0
+        self.folders = 0
+
+        threading.Thread(target=self._run, args=(list(roots),), daemon=True).start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _run(self, roots):
+        self._batch = []
+        self._last_send = time.monotonic()
+
+        try:
+            for root in roots:
+                if self.cancelled:
+                    break
+                if "://" not in root and os.path.isdir(root):
+                    self._walk(root, 0)
+                else:
+                    self._add(root)
+        except Exception as e:
+            print(f"Folder scan error: {e}")
+        finally:
+            # Whatever was found still gets added, the window stops its spinner
+            self._send()
+            GLib.idle_add(self._finish, self.found)
+
+    def _walk(self, folder, depth):
+        try:
+            with os.scandir(folder) as entries:
+                entries = sorted(entries, key=lambda e: natural_key(e.name))
+        except OSError as e:
+            print(f"Folder scan error: {e}")
+            return
+
+        self.folders += 1
+        subfolders = []
+
+        for entry in entries:
+            if self.cancelled:
+                return
+            try:
+                if entry.is_dir():
+                    if not entry.name.startswith("."):
+                        subfolders.append(entry.path)
+                elif is_media(entry.name):
+                    self._add(entry.path)
+            except OSError:
+                continue
+
+        if depth < self._max_depth:
+            for subfolder in subfolders:
+                if self.cancelled:
+                    return
+                self._walk(subfolder, depth + 1)
+
+    def _add(self, path):
+        self._batch.append(path)
+        self.found += 1
+        # The first file goes out alone so playback starts right away
+        if (
+            self.found == 1
+            or len(self._batch) >= BATCH_SIZE
+            or time.monotonic() - self._last_send > BATCH_INTERVAL
+        ):
+            self._send()
+
+    def _send(self):
+        self._last_send = time.monotonic()
+        if self._batch:
+            batch, self._batch = self._batch, []
+            GLib.idle_add(self._deliver, batch, self.found, self.folders)
+
+    def _deliver(self, batch, found, folders):
+        if not self.cancelled:
+            self._on_batch(batch)
+            self._on_progress(found, folders)
+        return GLib.SOURCE_REMOVE
+
+    def _finish(self, found):
+        if not self.cancelled:
+            self._on_done(found)
+        return GLib.SOURCE_REMOVE
+
+
+class DropClassifier:
+    """Sort dropped files into media, folders and subtitles without blocking.
+
+    Known extensions are decided from the name. Other files are queried with
+    query_info_async, at most MAX_QUERIES at a time, using the fast content
+    type so no file headers are read. on_done(results) gets (path, kind)
+    pairs in drop order, kind is "media", "folder", "sub" or None.
+    """
+
+    def __init__(self, files, cancellable, on_done):
+        self._files = list(files)
+        self._cancellable = cancellable
+        self._on_done = on_done
+        self._results: list = [None] * len(self._files)
+        self._queue = []
+        self._running = 0
+
+        for index, file in enumerate(self._files):
+            path = file.get_path() or file.get_uri()
+            ext = os.path.splitext(file.get_basename() or "")[1].lower()
+            if ext in SUB_EXTS:
+                self._results[index] = (path, "sub")
+            elif ext in MEDIA_EXTS:
+                self._results[index] = (path, "media")
+            else:
+                self._queue.append(index)
+
+        self._next()
+
+    def _next(self):
+        if self._cancellable.is_cancelled():
+            return
+
+        while self._queue and self._running < MAX_QUERIES:
+            index = self._queue.pop(0)
+            self._running += 1
+            self._files[index].query_info_async(
+                "standard::type,standard::fast-content-type",
+                Gio.FileQueryInfoFlags.NONE,
+                GLib.PRIORITY_DEFAULT,
+                self._cancellable,
+                self._on_info,
+                index,
+            )
+
+        if not self._queue and not self._running:
+            self._on_done(self._results)
+
+    def _on_info(self, file, result, index):
+        self._running -= 1
+        path = file.get_path() or file.get_uri()
+        kind = None
+
+        try:
+            info = file.query_info_finish(result)
+            mime = info.get_attribute_string("standard::fast-content-type") or ""
+            if info.get_file_type() == Gio.FileType.DIRECTORY:
+                kind = "folder"
+            elif mime.startswith(MEDIA_TYPES):
+                kind = "media"
+        except GLib.Error as e:
+            if e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                return
+            print(f"Drop error: {e.message}")
+
+        self._results[index] = (path, kind)
+        self._next()
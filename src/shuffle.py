@@ -0,0 +1,63 @@
+# shuffle.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import random
+
+
+class ShuffleEngine:
+    """Keep mpv's playlist in shuffled order while files are added.
+
+    The whole playlist is only reshuffled when shuffle is turned on.
+    Files added later are moved into random spots among the entries that
+    weren't played yet, so the order being played through stays as it was.
+    """
+
+    def __init__(self, player):
+        self._mpv = player
+        self._random = random.Random()
+        self.enabled = False
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+
+        self.enabled = enabled
+        if enabled:
+            self._mpv.command("playlist-shuffle")
+        else:
+            # mpv puts entries added since the shuffle after the others
+            self._mpv.command("playlist-unshuffle")
+
+    def place(self, start):
+        """Spread the entries from start to the end into the unplayed part.
+
+        Each one is inserted at a random spot after the playing entry,
+        like an inside-out Fisher-Yates, so adding k files costs k moves.
+        """
+        if not self.enabled:
+            return
+
+        count = self._mpv.playlist_count or 0
+        pos = self._mpv.playlist_pos
+        first = pos + 1 if pos is not None and pos >= 0 else 0
+
+        for index in range(max(start, first), count):
+            target = self._random.randint(first, index)
+            if target != index:
+                self._mpv.command("playlist-move", index, target)
@@ -0,0 +1,68 @@
+# state.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import time
+
+
+class PlayerState:
+    """Last known values of a player's properties, fed by its observers.
+
+    Readers like MPRIS answer from here without a round trip to mpv.
+    update() takes the observer's name and value, "-" becomes "_".
+    """
+
+    def __init__(self):
+        self.path: str | None = None
+        self.media_title: str | None = None
+        self.duration: float | None = None
+        self.pause = False
+        self.core_idle = True
+        self.speed = 1.0
+        self.volume = 100.0
+        self.loop_file = False
+        self.loop_playlist = False
+        self.playlist_pos = -1
+        self.playlist_count = 0
+        # mpv's id of the playing entry, from start-file
+        self.playlist_entry_id: int | None = None
+        self.time_pos: float | None = None
+        # Cover art or a video frame, see artwork.py
+        self.art_url: str | None = None
+        # When time_pos was received, on the monotonic clock
+        self.time_stamp = time.monotonic()
+
+    def update(self, name, value):
+        if name in ("core-idle", "speed"):
+            # Extrapolate from here on with the new rate
+            if self.time_pos is not None:
+                self.time_pos = self.position()
+            self.time_stamp = time.monotonic()
+        elif name == "time-pos":
+            self.time_stamp = time.monotonic()
+        setattr(self, name.replace("-", "_"), value)
+
+    def position(self):
+        """Playback position in seconds, extrapolated from the last time-pos."""
+        if self.time_pos is None:
+            return 0.0
+        if self.core_idle:
+            return self.time_pos
+
+        pos = self.time_pos + (time.monotonic() - self.time_stamp) * (self.speed or 1)
+        return min(pos, self.duration) if self.duration else pos
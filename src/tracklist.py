@@ -0,0 +1,150 @@
+# tracklist.py
+#
+# Copyright 2026 Diego Povliuk
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import gi
+import os
+
+from .artwork import artwork_cache
+from .metadata import metadata_cache
+
+gi.require_version("Gio", "2.0")
+gi.require_version("GLib", "2.0")
+from gi.repository import Gio, GLib
+
+TRACK_PREFIX = "/io/github/diegopvlk/Cine/Track/"
+NO_TRACK = "/org/mpris/MediaPlayer2/TrackList/NoTrack"
+
+# Entries read from mpv at a time
+PAGE_SIZE = 100
+# Tracks published before and after the playing one
+TRACKS_AROUND = 50
+
+
+def track_path(entry_id):
+    """MPRIS track id of a playlist entry, from its mpv id."""
+    return NO_TRACK if entry_id is None else f"{TRACK_PREFIX}{entry_id}"
+
+
+class TrackList:
+    """A paged view of mpv's playlist for the MPRIS TrackList interface.
+
+    Entries are read page by page through playlist/N/..., never the whole
+    playlist property, and kept until invalidate() is called. Only the tracks
+    around the playing one are published, as ids from mpv's playlist entries.
+    """
+
+    def __init__(self):
+        self._mpv = None
+        self._pages: dict[int, list[dict]] = {}
+        self._indexes: dict[str, int] = {}
+
+    def set_player(self, player):
+        self._mpv = player
+        self.invalidate()
+
+    def invalidate(self):
+        self._pages.clear()
+        self._indexes.clear()
+
+    def _get(self, name):
+        try:
+            return self._mpv[name]
+        except Exception:
+            # Titles are missing unless the playlist file had one
+            return None
+
+    def _load_page(self, page):
+        count = self._get("playlist-count") or 0
+        entries = []
+
+        for index in range(page * PAGE_SIZE, min(count, (page + 1) * PAGE_SIZE)):
+            entry_id = self._get(f"playlist/{index}/id")
+            track = track_path(index if entry_id is None else entry_id)
+            self._indexes[track] = index
+            entries.append(
+                {
+                    "track": track,
+                    "filename": self._get(f"playlist/{index}/filename") or "",
+                    "title": self._get(f"playlist/{index}/title"),
+                }
+            )
+
+        self._pages[page] = entries
+        return entries
+
+    def entry(self, index):
+        if not self._mpv or index is None or index < 0:
+            return None
+
+        page = index // PAGE_SIZE
+        entries = self._pages.get(page)
+        if entries is None:
+            entries = self._load_page(page)
+
+        offset = index - page * PAGE_SIZE
+        return entries[offset] if offset < len(entries) else None
+
+    def track_id(self, index):
+        entry = self.entry(index)
+        return entry["track"] if entry else NO_TRACK
+
+    def tracks(self, current, count):
+        """First index and ids of the published tracks, around current."""
+        if not self._mpv:
+            return 0, []
+
+        current = max(0, current or 0)
+        start = max(0, current - TRACKS_AROUND)
+        end = min(count or 0, current + TRACKS_AROUND + 1)
+        return start, [self.track_id(index) for index in range(start, end)]
+
+    def find(self, track):
+        """Index of a track id from the loaded pages, or None."""
+        return self._indexes.get(track)
+
+    def metadata(self, index):
+        """MPRIS metadata of an entry, resolved when asked for."""
+        entry = self.entry(index)
+        if not entry:
+            return {"mpris:trackid": GLib.Variant("o", NO_TRACK)}
+
+        filename = entry["filename"]
+        info = metadata_cache.lookup(filename)
+        title = (
+            entry["title"]
+            or (info and info["title"])
+            or os.path.basename(filename.rstrip("/"))
+            or filename
+        )
+
+        url = Gio.File.new_for_commandline_arg(filename).get_uri()
+        metadata = {
+            "mpris:trackid": GLib.Variant("o", entry["track"]),
+            "xesam:title": GLib.Variant("s", str(title)),
+            "xesam:url": GLib.Variant("s", url),
+        }
+        if info and info["duration"]:
+            duration = int(info["duration"] * 1_000_000)
+            metadata["mpris:length"] = GLib.Variant("x", duration)
+
+        art_url = artwork_cache.lookup(filename)
+        if art_url:
+            metadata["mpris:artUrl"] = GLib.Variant("s", art_url)
+
+        return metadata
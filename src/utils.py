@@ -19,11 +19,12 @@
 
 import gi
 import os
-import ctypes
+import time
 from gettext import gettext as _
 
+gi.require_version("Gio", "2.0")
 gi.require_version("GLib", "2.0")
-from gi.repository import GLib
+from gi.repository import Gio, GLib
 
 xdg_pictures = GLib.get_user_special_dir(GLib.UserDirectory.DIRECTORY_PICTURES)
 SCREENSHOT_DIR = os.path.join(xdg_pictures, "Cine Screenshots") if xdg_pictures else ""
@@ -33,22 +34,67 @@ CONFIG_DIR = os.path.join(base_config, "cine")
 INPUT_CONF = os.path.join(CONFIG_DIR, "input.conf")
 os.makedirs(CONFIG_DIR, exist_ok=True)
 
+# Set CINE_PROFILE=1 to print startup and playback timings
+PROFILE = bool(os.environ.get("CINE_PROFILE"))
+# Set CINE_RENDERER=sw to use mpv's software renderer even if GL works
+SOFTWARE_RENDER = os.environ.get("CINE_RENDERER") == "sw"
+PROBE_TIMEOUT = 2
+
+
+def log_timing(label, start):
+    """Print the time elapsed since start (time.monotonic) when profiling."""
+    if PROFILE:
+        elapsed = (time.monotonic() - start) * 1000
+        # Flushed, benchmarks read it from a pipe
+        print(f"[cine] {label}: {elapsed:.1f} ms", flush=True)
+
+
+def probe_video_size(path, cancellable, callback):
+    """Run ffprobe in the background and pass (width, height) to callback."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=width,height",
+        "-of",
+        "csv=s=x:p=0",
+        path,
+    ]
 
-def get_gpu_vendor(display, libgl):
     try:
-        context = display.get_default_seat().get_display().create_gl_context()
-        context.realize()
-        context.make_current()
-
-        glGetString = libgl.glGetString
-        glGetString.restype = ctypes.c_char_p
-        glGetString.argtypes = [ctypes.c_uint]
-
-        # GL_VENDOR is 0x1F00
-        return glGetString(0x1F00).decode("utf-8").lower()
-    except Exception as e:
-        print(f"get_gpu_vendor error: {e}")
-        return None
+        proc = Gio.Subprocess.new(
+            cmd,
+            Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_SILENCE,
+        )
+    except GLib.Error as e:
+        print(f"Metadata probe skipped or failed: {e.message}")
+        return
+
+    # Cancelling only stops communicate, the process has to be killed too
+    cancel_id = cancellable.connect(lambda *a: proc.force_exit())
+    timeout_id = GLib.timeout_add_seconds(PROBE_TIMEOUT, cancellable.cancel)
+
+    def on_done(proc, result):
+        if not cancellable.is_cancelled():
+            GLib.source_remove(timeout_id)
+        cancellable.disconnect(cancel_id)
+        try:
+            _ok, output, _err = proc.communicate_utf8_finish(result)
+        except GLib.Error as e:
+            if not e.matches(Gio.io_error_quark(), Gio.IOErrorEnum.CANCELLED):
+                print(f"Metadata probe skipped or failed: {e.message}")
+            return
+
+        if output and output.strip():
+            # 1920x1080
+            res = output.strip().splitlines()[0].split("x")
+            if len(res) >= 2 and res[0].isdigit() and res[1].isdigit():
+                callback(int(res[0]), int(res[1]))
+
+    proc.communicate_utf8_async(None, cancellable, on_done)
 
 
 def format_time(seconds):
@@ -120,3 +166,41 @@ SUB_EXTS: tuple = (
     ".utf-8",
     ".utf8",
 )
+
+MEDIA_EXTS: tuple = (
+    ".3gp",
+    ".aac",
+    ".aiff",
+    ".alac",
+    ".ape",
+    ".avi",
+    ".avif",
+    ".bmp",
+    ".flac",
+    ".flv",
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".m2ts",
+    ".m4a",
+    ".m4v",
+    ".mka",
+    ".mkv",
+    ".mov",
+    ".mp3",
+    ".mp4",
+    ".mpeg",
+    ".mpg",
+    ".mts",
+    ".ogg",
+    ".ogv",
+    ".opus",
+    ".png",
+    ".ts",
+    ".wav",
+    ".webm",
+    ".webp",
+    ".wma",
+    ".wmv",
+    ".wv",
+)
@@ -25,45 +25,62 @@ from typing import cast
 from gettext import gettext as _
 
 from .utils import (
-    get_gpu_vendor,
+    probe_video_size,
     format_time,
     MBTN_MAP,
     KEY_REMAP,
     SUB_EXTS,
-    SCREENSHOT_DIR,
-    CONFIG_DIR,
-    INPUT_CONF,
+    PROFILE,
+    SOFTWARE_RENDER,
 )
 
 DEFAULT_WIDTH, DEFAULT_HEIGHT = 1088, 612
 
+from .dispatch import PropertyDispatcher, COSMETIC
+from .governor import VisibilityGovernor
+from .gpu import get_gpu_caps
+from .artwork import artwork_cache
+from .metadata import metadata_cache
+from .mpris import MPRIS
 from .options import OptionsMenuButton
+from .player import create_player, enqueue
 from .playlist import Playlist
-from .preferences import sync_mpv_with_settings
-from .shortcuts import INTERNAL_BINDINGS, populate_shortcuts_dialog_mpv
+from .preferences import settings, sync_mpv_with_settings
+from .render import RenderScheduler, SoftwareVideo
+from .scanner import DropClassifier, FolderScanner
+from .shortcuts import populate_shortcuts_dialog_mpv
+from .shuffle import ShuffleEngine
+from .state import PlayerState
 
 gi.require_version("Adw", "1")
 gi.require_version("Gio", "2.0")
 gi.require_version("Gdk", "4.0")
 gi.require_version("GLib", "2.0")
 gi.require_version("Gtk", "4.0")
+gi.require_version("GObject", "2.0")
 gi.require_version("GdkWayland", "4.0")
 gi.require_version("GdkX11", "4.0")
-from gi.repository import Adw, Gio, Gdk, GLib, Gtk
+from gi.repository import Adw, Gio, Gdk, GLib, GObject, Gtk
 from gi.repository import (
     GdkWayland,  # pyright: ignore[reportAttributeAccessIssue]
     GdkX11,
 )
 
-libegl = ctypes.CDLL("libEGL.so.1")
-egl_get_proc_address = libegl.eglGetProcAddress
-egl_get_proc_address.restype = ctypes.c_void_p
-egl_get_proc_address.argtypes = [ctypes.c_char_p]
-
 GL_FRAMEBUFFER_BINDING = 0x8CA6
-libgl = ctypes.CDLL("libGL.so.1")
-glGetIntegerv = libgl.glGetIntegerv
-glGetIntegerv.argtypes = [ctypes.c_uint, ctypes.POINTER(ctypes.c_int)]
+
+try:
+    libegl = ctypes.CDLL("libEGL.so.1")
+    egl_get_proc_address = libegl.eglGetProcAddress
+    egl_get_proc_address.restype = ctypes.c_void_p
+    egl_get_proc_address.argtypes = [ctypes.c_char_p]
+
+    libgl = ctypes.CDLL("libGL.so.1")
+    glGetIntegerv = libgl.glGetIntegerv
+    glGetIntegerv.argtypes = [ctypes.c_uint, ctypes.POINTER(ctypes.c_int)]
+except OSError as e:
+    # Without GL, windows use the software renderer
+    print(f"GL libraries error: {e}")
+    libgl = None
 
 gtk = ctypes.CDLL("libgtk-4.so.1")
 display = Gdk.Display.get_default()
@@ -72,6 +89,8 @@ display = Gdk.Display.get_default()
 @Gtk.Template(resource_path="/io/github/diegopvlk/Cine/window.ui")
 class CineWindow(Adw.ApplicationWindow):
     __gtype_name__ = "CineWindow"
+    # Player state shown outside the window changed, with a key like "pause"
+    __gsignals__ = {"state-changed": (GObject.SignalFlags.RUN_FIRST, None, (str,))}
 
     toast_overlay: Adw.ToastOverlay = Gtk.Template.Child()
     video_overlay: Gtk.Overlay = Gtk.Template.Child()
@@ -118,15 +137,24 @@ class CineWindow(Adw.ApplicationWindow):
 
         Gtk.WindowGroup().add_window(self)
 
-        self.gl_area: Gtk.GLArea = Gtk.GLArea()
-        self.offload: Gtk.GraphicsOffload = Gtk.GraphicsOffload(child=self.gl_area)
-        self.offload.set_black_background(True)
-
-        vendor: str | None = get_gpu_vendor(display, libgl)
-        if vendor and "nvidia" in vendor:
-            self.offload.set_enabled(Gtk.GraphicsOffloadEnabled.DISABLED)
+        self.gpu_caps: dict = get_gpu_caps(display, libgl)
+        self.software_render: bool = (
+            SOFTWARE_RENDER or not self.gpu_caps["gl"] or libgl is None
+        )
 
-        self.video_overlay.set_child(self.offload)
+        self.video_area: Gtk.Widget
+        if self.software_render:
+            self.video_area = SoftwareVideo()
+            self.video_overlay.set_child(self.video_area)
+        else:
+            self.video_area = Gtk.GLArea()
+            self.offload: Gtk.GraphicsOffload = Gtk.GraphicsOffload(
+                child=self.video_area
+            )
+            self.offload.set_black_background(True)
+            if not self.gpu_caps["offload"]:
+                self.offload.set_enabled(Gtk.GraphicsOffloadEnabled.DISABLED)
+            self.video_overlay.set_child(self.offload)
 
         self.can_go_prev: bool = False
         self.can_go_next: bool = False
@@ -137,66 +165,41 @@ class CineWindow(Adw.ApplicationWindow):
         self.volume_update_timer_id: int = 0
         self.inhibit_id: int = 0
         self.last_seek_scroll_time: float = 0
-        self.loaded_path: str
+        self.loaded_path: str = ""
+        self.playlist_dialog: Playlist | None = None
+        self.folder_scans: list[FolderScanner] = []
+        self.size_probe: Gio.Cancellable | None = None
+        self.art_probe: Gio.Cancellable | None = None
+        self.art_path: str = ""
+        # Cancelled when the window closes, for async work tied to it
+        self.cancellable: Gio.Cancellable = Gio.Cancellable()
 
         self.mpv_ctx: mpv.MpvRenderContext
-
-        self.mpv = mpv.MPV(
-            # terminal=True,
-            # log_handler=print,
-            loglevel="info",
-            audio_client_name=_("Cine"),
-            screenshot_directory=SCREENSHOT_DIR,
-            screenshot_template="cine_%n",
-            config=True,
-            config_dir=CONFIG_DIR,
-            input_default_bindings=False,
-            input_vo_keyboard=True,
-            load_scripts=True,
-            audio_display="embedded-first",
-            audio_file_auto="fuzzy",
-            sub_auto="fuzzy",
-            sub_file_paths="sub:subs:subtitles:Sub:Subs:Subtitles:srt:srts:Srt:Srts",
-            sub_border_size=2,
-            sub_shadow_offset=0.6,
-            sub_border_color="#B6000000",
-            sub_shadow_color="#97000000",
-            sub_color="#ebebeb",
-            sub_use_margins=False,
-            sub_font="Adwaita Sans SemiBold",
-            osd_font="Adwaita Sans",
-            osd_bold=True,
-            osd_bar=False,
-            osd_blur=1,
-            osd_border_size=1.5,
-            osd_shadow_offset=0.6,
-            osd_border_color="#BE000000",
-            osd_shadow_color="#1B000000",
-            osd_margin_x=66,
-            osd_margin_y=66,
-            volume_max=150,
-        )
+        self.render_scheduler = RenderScheduler(self.video_area)
+        if isinstance(self.video_area, SoftwareVideo):
+            self.video_area.scheduler = self.render_scheduler
+
+        pool = getattr(self.app, "player_pool", None)
+        self.mpv: mpv.MPV = (pool and pool.take()) or create_player()
+        self.shuffle = ShuffleEngine(self.mpv)
+        self.state = PlayerState()
+        # Connects to the bus meanwhile, released by the application in window-removed
+        self.mpris = MPRIS(self)
+        self.governor = VisibilityGovernor(self)
 
         self.conf_hwdec = list(
             filter(lambda x: x != "no", cast(list, self.mpv["hwdec"]))
         )
-        self.mpv["keep-open"] = "yes"
-        self.mpv["keep-open-pause"] = "no"
-        self.mpv["vo"] = "libmpv"
-        self.mpv["osc"] = "no"
-        self.mpv["load-console"] = "no"
-        self.mpv.command("change-list", "watch-later-options", "remove", "vid")
-        self.mpv.command("change-list", "watch-later-options", "remove", "aid")
+        self.conf_video_sync = self.mpv["video-sync"]
+        self.monitor: Gdk.Monitor | None = None
+        self.monitor_rate_id: int = 0
 
         self._setup_actions()
         self._setup_elements()
         self._setup_event_handlers()
+        self.dispatch = PropertyDispatcher(self)
         self._setup_observers()
-
-        self.mpv.command("load-input-conf", f"memory://{INTERNAL_BINDINGS}")
-
-        if os.path.exists(INPUT_CONF):
-            self.mpv.command("load-input-conf", INPUT_CONF)
+        self.mpris.watch()
 
         sync_mpv_with_settings(self)
 
@@ -286,8 +289,9 @@ class CineWindow(Adw.ApplicationWindow):
         self.chapter_popover_label.add_css_class("numeric")
         self.chapter_popover.set_child(self.chapter_popover_label)
 
-        self.gl_area.connect("realize", self._on_realize_area)
-        self.gl_area.connect("render", self._on_render_area)
+        self.video_area.connect("realize", self._on_realize_area)
+        if not self.software_render:
+            self.video_area.connect("render", self._on_render_area)
 
     def _setup_event_handlers(self):
         key_controller = Gtk.EventControllerKey()
@@ -345,6 +349,7 @@ class CineWindow(Adw.ApplicationWindow):
         self.motion_controls.set_propagation_limit(Gtk.PropagationLimit.NONE)
 
         self.connect("realize", self._on_realize)
+        self.connect("close-request", self._on_close_request)
 
         buttons = [
             self.primary_menu_button,
@@ -365,6 +370,41 @@ class CineWindow(Adw.ApplicationWindow):
             # When dragging the window while in fullscreen
             # fullscreened signal is not triggered, so use this:
             surface.connect("notify::state", self._set_fs_state)
+            surface.connect("notify::state", self.governor.on_state_changed)
+
+        if surface:
+            surface.connect("enter-monitor", self._on_enter_monitor)
+
+    def _on_enter_monitor(self, _surface, monitor):
+        self._release_monitor()
+        self.monitor = monitor
+        self.monitor_rate_id = monitor.connect(
+            "notify::refresh-rate", self._update_display_fps
+        )
+        self._update_display_fps()
+
+    def _update_display_fps(self, *args):
+        """Tell mpv the refresh rate, vo=libmpv can't find it by itself."""
+        rate = self.monitor.get_refresh_rate() / 1000 if self.monitor else 0
+
+        surface = self.get_surface()
+        if not rate and surface and (frame_clock := surface.get_frame_clock()):
+            # Fall back to the frame clock timings
+            interval, _time = frame_clock.get_refresh_info(frame_clock.get_frame_time())
+            rate = 1_000_000 / interval if interval else 0
+
+        if rate:
+            try:
+                self.mpv["display-fps-override"] = rate
+            except Exception as e:
+                print(f"Display FPS error: {e}")
+
+    def _release_monitor(self):
+        # The monitor outlives the window, its handler would keep it alive
+        if self.monitor and self.monitor_rate_id:
+            self.monitor.disconnect(self.monitor_rate_id)
+        self.monitor = None
+        self.monitor_rate_id = 0
 
     def _set_fs_state(self, top_level, _pspec):
         state: Gdk.ToplevelState = top_level.get_state()
@@ -527,8 +567,9 @@ class CineWindow(Adw.ApplicationWindow):
     def _on_open_playlist(self, *args):
         if self.mpv.idle_active:
             return
-        playlist = Playlist(self)
-        playlist.present(self)
+        if not self.playlist_dialog:
+            self.playlist_dialog = Playlist(self)
+        self.playlist_dialog.present_for(self)
 
     def _on_open_folder_dialog(self, _action, _param):
         dialog = Gtk.FileDialog(title=_("Open Folder"))
@@ -541,14 +582,8 @@ class CineWindow(Adw.ApplicationWindow):
         def on_open(dialog, result):
             try:
                 folder = dialog.select_folder_finish(result)
-                self.mpv.stop()
-                path = folder.get_path()
-                self.mpv.loadfile(path, "append-play")
-                GLib.idle_add(
-                    lambda *a: self._on_shuffle_toggled(
-                        self.playlist_shuffle_toggle_button
-                    )
-                )
+                path = folder.get_path() or folder.get_uri()
+                self.add_paths([path], "replace", scan=True)
 
             except GLib.Error as e:
                 print(f"Dialog error: {e.message}")
@@ -596,44 +631,37 @@ class CineWindow(Adw.ApplicationWindow):
             None,
             lambda d, res: self._on_open_response(d, res, mode, from_playlist),
         )
-        if from_playlist:
-            playlist_dialog = cast(Playlist, self.get_visible_dialog())
-            playlist_dialog.spinner.set_visible(True)
+        if from_playlist and self.playlist_dialog:
+            self.playlist_dialog.spinner.set_visible(True)
 
     def _on_open_response(self, dialog, result, mode, from_playlist=False):
         try:
             files = dialog.open_multiple_finish(result)
 
             if mode == "clear-and-add":
+                self._cancel_folder_scans()
                 self.mpv.stop()
 
-            for file in files:
-                path = file.get_path() or file.get_uri()
+            paths = [file.get_path() or file.get_uri() for file in files]
 
-                if mode == "sub-add":
+            if mode == "sub-add":
+                for path in paths:
                     self.mpv.sub_add(path)
-                elif mode == "audio-add":
+            elif mode == "audio-add":
+                for path in paths:
                     self.mpv.audio_add(path)
-                else:
-                    self.mpv.loadfile(path, "append-play")
+            else:
+                self.add_paths(paths)
 
             if mode == "clear-and-add":
                 self.mpv.pause = False
 
-            if from_playlist:
-                playlist_dialog = cast(Playlist, self.get_visible_dialog())
-                playlist_dialog._populate_list()
-                playlist_dialog.spinner.set_visible(False)
-
-            GLib.idle_add(
-                lambda *a: self._on_shuffle_toggled(self.playlist_shuffle_toggle_button)
-            )
+            if from_playlist and self.playlist_dialog:
+                self.playlist_dialog.spinner.set_visible(False)
 
         except GLib.Error as e:
-            if from_playlist:
-                playlist_dialog = cast(Playlist, self.get_visible_dialog())
-                playlist_dialog._populate_list()
-                playlist_dialog.spinner.set_visible(False)
+            if from_playlist and self.playlist_dialog:
+                self.playlist_dialog.spinner.set_visible(False)
             print(f"Dialog error: {e.message}")
 
     def _on_open_sub_menu(self, *args):
@@ -728,8 +756,8 @@ class CineWindow(Adw.ApplicationWindow):
         )
 
     def _update_chapter_marks(self, chapters):
+        self.video_progress_scale.clear_marks()
         if not chapters:
-            self.video_progress_scale.clear_marks()
             return
         for chapter in chapters:
             time_pos = chapter.get("time")
@@ -817,13 +845,9 @@ class CineWindow(Adw.ApplicationWindow):
         self.mpv.time_pos = adjustment.props.value
 
     def _on_shuffle_toggled(self, button):
-        if button.props.active:
-            self.mpv.command("playlist-shuffle")
-        else:
-            self.mpv.command("playlist-unshuffle")
-
-        if dialog := cast(Playlist, self.get_visible_dialog()):
-            dialog._populate_list()
+        self.shuffle.set_enabled(button.props.active)
+        self.emit("state-changed", "shuffle")
+        self.emit("state-changed", "playlist")
 
     def _on_loop_playlist_toggled(self, button):
         if button.props.active:
@@ -862,6 +886,7 @@ class CineWindow(Adw.ApplicationWindow):
 
         self.playlist_shuffle_toggle_button.props.visible = has_multiple
         self.playlist_loop_toggle_button.props.visible = has_multiple
+        self.emit("state-changed", "nav")
 
     def _on_drop_enter(self, target, _x, _y):
         GLib.timeout_add(10, self.revealer_drop_indicator.set_reveal_child, True)
@@ -899,40 +924,77 @@ class CineWindow(Adw.ApplicationWindow):
         GLib.timeout_add(100, self.drop_label.set_text, "")
 
     def _on_drop(self, _target, list: Gdk.FileList, _x, _y):
-        first_file = True
-
-        for file in list.get_files():
-            info = file.query_info(
-                "standard::content-type,standard::type",
-                Gio.FileQueryInfoFlags.NONE,
-                None,
-            )
-            path = file.get_path() or file.get_uri()
-            file_type = info.get_file_type()
-            mime_type = info.get_content_type() or ""
-
-            mode = "replace" if first_file else "append-play"
+        DropClassifier(list.get_files(), self.cancellable, self._on_drop_classified)
+        return True
 
-            if file_type == Gio.FileType.DIRECTORY:
-                self.mpv.loadfile(path, mode)
-                first_file = False
-                continue
+    def _on_drop_classified(self, results):
+        paths = []
+        has_folders = False
 
-            name = cast(str, file.get_basename()).lower()
-            if name.endswith(SUB_EXTS):
+        for path, kind in results:
+            if kind == "sub":
                 if not self.mpv.idle_active:
                     self.mpv.command("sub-add", path, "select")
-                continue
+            elif kind:
+                paths.append(path)
+                has_folders = has_folders or kind == "folder"
 
-            valid_types = ("video/", "audio/", "image/")
-            if mime_type.startswith(valid_types):
-                self.mpv.loadfile(path, mode)
-                first_file = False
+        if paths:
+            self.add_paths(paths, "replace", scan=has_folders)
 
-        GLib.idle_add(
-            lambda *a: self._on_shuffle_toggled(self.playlist_shuffle_toggle_button)
+    def add_paths(self, paths, mode="append-play", scan=False):
+        """Add files to the playlist, with scan folders are expanded by Cine."""
+        paths = [path for path in paths if path]
+        if mode == "replace":
+            self._cancel_folder_scans()
+
+        if not scan:
+            self._enqueue_shuffled(paths, mode)
+            return
+
+        scanner = None
+
+        def on_batch(batch):
+            nonlocal mode
+            self._enqueue_shuffled(batch, mode)
+            mode = "append-play"
+
+        def on_done(_found):
+            self.folder_scans.remove(scanner)
+            self._on_scan_progress(None, 0)
+
+        scanner = FolderScanner(
+            paths,
+            settings.get_int("folder-depth"),
+            on_batch,
+            self._on_scan_progress,
+            on_done,
+        )
+        self.folder_scans.append(scanner)
+
+    def _enqueue_shuffled(self, paths, mode):
+        start = 0 if mode == "replace" else self.mpv.playlist_count or 0
+        enqueue(self.mpv, paths, mode)
+        self.shuffle.place(start)
+        if mode == "replace" or self.shuffle.enabled:
+            # Entries changed in place, playlist-count alone can't tell
+            self.emit("state-changed", "playlist")
+
+    def _on_scan_progress(self, found, folders):
+        scanning = bool(self.folder_scans)
+        self.spinner.set_visible(scanning)
+        self.spinner.set_tooltip_text(
+            _("Adding {} files from {} folders").format(found, folders)
+            if scanning and found
+            else None
         )
 
+    def _cancel_folder_scans(self):
+        for scanner in self.folder_scans:
+            scanner.cancel()
+        self.folder_scans.clear()
+        self._on_scan_progress(None, 0)
+
     def _sync_fullscreen(self, mpv_is_fs):
         self.is_fullscreen = mpv_is_fs
         if mpv_is_fs:
@@ -1077,6 +1139,11 @@ class CineWindow(Adw.ApplicationWindow):
         return param
 
     def _on_realize_area(self, area):
+        if self.software_render:
+            self.mpv_ctx = mpv.MpvRenderContext(self.mpv, "sw")
+            self.render_scheduler.attach(self.mpv_ctx)
+            return
+
         area.make_current()
 
         proc_address_fn = mpv.MpvGlGetProcAddressFn(
@@ -1094,10 +1161,7 @@ class CineWindow(Adw.ApplicationWindow):
             **display_param,
         )
 
-        self.mpv_ctx.update_cb = lambda: GLib.idle_add(
-            self.gl_area.queue_render,
-            priority=GLib.PRIORITY_HIGH_IDLE,  # pyright: ignore[reportCallIssue]
-        )
+        self.render_scheduler.attach(self.mpv_ctx)
 
         self.fbo = ctypes.c_int()
 
@@ -1108,7 +1172,7 @@ class CineWindow(Adw.ApplicationWindow):
             glGetIntegerv(GL_FRAMEBUFFER_BINDING, self.fbo)
             scale = area.props.scale_factor
 
-            self.mpv_ctx.render(
+            self.render_scheduler.render(
                 flip_y=True,
                 opengl_fbo={
                     "w": int(area.get_width() * scale),
@@ -1140,6 +1204,133 @@ class CineWindow(Adw.ApplicationWindow):
 
         self.set_default_size(new_w, new_h)
 
+    def probe_window_size(self, path):
+        """Resize from ffprobe or mpv's video-params, whichever comes first."""
+        self._cancel_size_probe()
+        probe = self.size_probe = Gio.Cancellable()
+
+        def on_cached(info):
+            if probe is not self.size_probe:
+                return
+            if info and info["width"] and info["height"]:
+                self.size_probe = None
+                self._set_window_size(info["width"], info["height"])
+                return
+
+            probe_video_size(
+                path,
+                probe,
+                lambda w, h: self._on_size_probed(path, w, h),
+            )
+
+        metadata_cache.lookup_async(path, on_cached)
+
+    def _on_size_probed(self, path, width, height):
+        metadata_cache.update(path, width=width, height=height)
+        if self.size_probe:
+            self.size_probe = None
+            self._set_window_size(width, height)
+
+    def _on_close_request(self, _window):
+        self.cancellable.cancel()
+        self._cancel_size_probe()
+        self._cancel_art_probe()
+        self._cancel_folder_scans()
+        self._release_monitor()
+        if PROFILE:
+            print(f"[cine] Render: {self.render_scheduler.stats()}")
+            print(f"[cine] Visibility: {self.governor.stats()}")
+        return False
+
+    def _cancel_size_probe(self, *args):
+        if self.size_probe:
+            self.size_probe.cancel()
+            self.size_probe = None
+
+    def _on_video_params(self, path, params):
+        width, height = params.get("dw", 0), params.get("dh", 0)
+        if not width or not height:
+            return
+
+        metadata_cache.update(path, width=width, height=height)
+        if self.size_probe:
+            self._cancel_size_probe()
+            self._set_window_size(width, height)
+
+    def _remember(self, path, key, value):
+        """Save a property of the file at path in the metadata cache."""
+        if path and value:
+            metadata_cache.update(path, **{key: value})
+
+    def _prefill_from_cache(self, path):
+        """Show cached duration, chapters and title before mpv demuxes the file."""
+        metadata_cache.lookup_async(path, lambda info: self._prefill(path, info))
+
+    def _prefill(self, path, info):
+        if not info or path != self.loaded_path:
+            return
+
+        if info["duration"]:
+            self._update_duration(info["duration"])
+        if info["chapters"]:
+            self.current_chapters = sorted(
+                info["chapters"], key=lambda x: x.get("time", 0)
+            )
+            self._update_chapter_marks(info["chapters"])
+        if info["title"]:
+            self.set_title(info["title"])
+
+    def _update_artwork(self, path, track_list):
+        """Publish embedded cover art or a video frame as the MPRIS artUrl."""
+        if path == self.art_path:
+            return
+
+        self._cancel_art_probe()
+        self._set_art_url(None)
+        # Empty while the file is opening, wait for its tracks
+        if not track_list:
+            return
+        self.art_path = path
+
+        cover = next((t for t in track_list if t.get("albumart")), None)
+        cover_file = cover.get("external-filename") if cover else None
+        if cover_file and os.path.isabs(cover_file):
+            self._set_art_url(GLib.filename_to_uri(cover_file))
+            return
+
+        has_video = any(t["type"] == "video" for t in track_list)
+        if not has_video or "://" in path:
+            return
+
+        cached = artwork_cache.lookup(path)
+        if cached:
+            self._set_art_url(cached)
+            return
+
+        self.art_probe = Gio.Cancellable()
+        artwork_cache.extract(
+            path,
+            cover.get("ff-index") if cover else None,
+            (self.state.duration or 0) * 0.1,
+            self.art_probe,
+            lambda uri: self._on_artwork_extracted(path, uri),
+        )
+
+    def _on_artwork_extracted(self, path, uri):
+        if path == self.art_path:
+            self.art_probe = None
+            self._set_art_url(uri)
+
+    def _set_art_url(self, uri):
+        if uri != self.state.art_url:
+            self.state.art_url = uri
+            self.emit("state-changed", "artwork")
+
+    def _cancel_art_probe(self):
+        if self.art_probe:
+            self.art_probe.cancel()
+            self.art_probe = None
+
     def _sync_inhibit(self):
         should_inhibit = not self.mpv.pause and not self.mpv.idle_active
 
@@ -1154,18 +1345,27 @@ class CineWindow(Adw.ApplicationWindow):
             self.inhibit_id = 0
 
     def _setup_observers(self):
+        post = self.dispatch.post
+        store = self.state.update
+
+        def notify(key):
+            post(f"state-{key}", self.emit, "state-changed", key, priority=COSMETIC)
+
         @self.mpv.event_callback("start-file")
         def on_start_file(event):
-            GLib.idle_add(self.spinner.set_visible, True)
+            post("spinner", self.spinner.set_visible, True)
             self.loaded_path = str(self.mpv.path)
+            post("prefill", self._prefill_from_cache, self.loaded_path)
+            store("playlist-entry-id", event.as_dict().get("playlist_entry_id"))
+            notify("track")
 
         @self.mpv.event_callback("file-loaded")
         def on_files_loaded(event):
-            GLib.idle_add(self.spinner.set_visible, False)
+            post("spinner", self.spinner.set_visible, False)
 
         @self.mpv.event_callback("end-file")
         def on_end_file(event):
-            GLib.idle_add(self.spinner.set_visible, False)
+            post("spinner", self.spinner.set_visible, False)
             info = event.as_dict()
             reason = info["reason"]
             if reason == b"error":
@@ -1177,21 +1377,32 @@ class CineWindow(Adw.ApplicationWindow):
 
         @self.mpv.property_observer("path")
         def on_path_change(_name, has_file):
+            store(_name, has_file)
             if has_file:
-                GLib.idle_add(self.play_pause_button.set_sensitive, has_file)
+                post("path", self.play_pause_button.set_sensitive, True)
 
         @self.mpv.property_observer("playlist-count")
-        def on_playlist_count_change(_name, _count):
-            GLib.idle_add(self._update_playlist_nav_sensitivity)
+        def on_playlist_count_change(_name, count):
+            store(_name, count)
+            post("playlist-nav", self._update_playlist_nav_sensitivity)
+            notify("playlist")
 
         @self.mpv.property_observer("loop-playlist")
         def on_loop_playlist_change(_name, value):
-            GLib.idle_add(self.playlist_loop_toggle_button.set_active, value == "inf")
-            GLib.idle_add(self._update_playlist_nav_sensitivity)
+            store(_name, value)
+            post(
+                "loop-playlist",
+                self.playlist_loop_toggle_button.set_active,
+                value == "inf",
+            )
+            post("playlist-nav", self._update_playlist_nav_sensitivity)
+            notify("loop")
 
         @self.mpv.property_observer("loop-file")
         def on_loop_file_change(_name, value):
-            GLib.idle_add(self.loop_file_toggle_button.set_active, value == "inf")
+            store(_name, value)
+            post("loop-file", self.loop_file_toggle_button.set_active, value == "inf")
+            notify("loop")
 
         @self.mpv.property_observer("fullscreen")
         def on_fs_change(_name, value):
@@ -1206,18 +1417,34 @@ class CineWindow(Adw.ApplicationWindow):
                 self.fullscreen_button.set_icon_name(icon)
                 self._sync_fullscreen(value)
 
-            GLib.idle_add(update)
+            post("fullscreen", update)
 
         @self.mpv.property_observer("time-pos")
         def on_time_change(_name, value):
-            GLib.idle_add(self._update_progress, float(value or 0))
+            store(_name, value)
+            post("time-pos", self._update_progress, float(value or 0))
+
+        @self.mpv.property_observer("video-params")
+        def on_video_params_change(_name, value):
+            if value:
+                post("video-params", self._on_video_params, self.loaded_path, value)
 
         @self.mpv.property_observer("duration")
         def on_duration_change(_name, value):
-            GLib.idle_add(self._update_duration, float(value or 0))
+            store(_name, value)
+            post("duration", self._update_duration, float(value or 0))
+            self._post_remember("duration", value)
+            notify("duration")
+
+        @self.mpv.property_observer("core-idle")
+        @self.mpv.property_observer("speed")
+        def on_clock_change(name, value):
+            store(name, value)
 
         @self.mpv.property_observer("volume")
         def on_volume_change(_name, value):
+            store(_name, value)
+
             def update_icon_and_vol_adj():
                 # block the signal to not trigger value-changed
                 self.volume_scale.handler_block(self.volume_handler_id)
@@ -1226,7 +1453,8 @@ class CineWindow(Adw.ApplicationWindow):
                 self.volume_scale.handler_unblock(self.volume_handler_id)
                 self._update_volume_icon(self.mpv.mute)
 
-            GLib.idle_add(update_icon_and_vol_adj)
+            post("volume", update_icon_and_vol_adj)
+            notify("volume")
 
         track_map = {
             "sid": "select-subtitle",
@@ -1243,35 +1471,49 @@ class CineWindow(Adw.ApplicationWindow):
                         GLib.Variant("i", val)
                     )
 
-            GLib.idle_add(set_track)
+            post(f"track-{name}", set_track)
 
         for prop in track_map.keys():
             self.mpv.property_observer(prop)(on_track_change)
 
         @self.mpv.property_observer("track-list")
         def on_track_list_change(_name, track_list):
-            GLib.idle_add(self._update_track_menus, track_list)
+            post("track-list", self._update_track_menus, track_list, priority=COSMETIC)
+            self._post_remember("tracks", track_list)
+            post(
+                "artwork",
+                self._update_artwork,
+                self.loaded_path,
+                track_list,
+                priority=COSMETIC,
+            )
 
         @self.mpv.property_observer("playlist-pos")
-        def on_pl_pos_change(_name, _value):
-            def update():
+        def on_pl_pos_change(_name, value):
+            store(_name, value)
+            notify("playlist-pos")
+
+            def update_nav():
                 self._update_playlist_nav_sensitivity()
-                if dialog := cast(Playlist, self.get_visible_dialog()):
-                    dialog._scroll_to_playing()
+                if self.playlist_dialog and self.playlist_dialog.get_mapped():
+                    self.playlist_dialog._scroll_to_playing()
 
-            GLib.idle_add(update)
+            post("playlist-pos", update_nav)
 
         @self.mpv.property_observer("chapter-list")
         def on_chapters_change(_name, value):
             self.current_chapters = (
                 sorted(value, key=lambda x: x.get("time", 0)) if value else []
             )
-            GLib.idle_add(self._update_chapter_marks, value)
+            post("chapter-list", self._update_chapter_marks, value, priority=COSMETIC)
+            self._post_remember("chapters", value)
 
         @self.mpv.property_observer("pause")
         def on_pause_change(_name, paused):
-            GLib.idle_add(self._sync_inhibit)
-            GLib.idle_add(self._update_play_pause_icon, paused)
+            store(_name, paused)
+            post("inhibit", self._sync_inhibit)
+            post("pause", self._update_play_pause_icon, paused)
+            notify("pause")
 
         @self.mpv.property_observer("eof-reached")
         def watch_eof(_name, value):
@@ -1288,7 +1530,7 @@ class CineWindow(Adw.ApplicationWindow):
 
                 self.start_page.set_visible(is_idle)
                 self.controls_box.set_visible(not is_idle)
-                self.gl_area.set_visible(not is_idle)
+                self.video_area.set_visible(not is_idle)
 
                 if is_idle:
                     self.revealer_ui.set_reveal_child(True)
@@ -1296,12 +1538,15 @@ class CineWindow(Adw.ApplicationWindow):
 
                 self._sync_inhibit()
 
-            GLib.idle_add(update_state)
+            post("idle-active", update_state)
 
         @self.mpv.property_observer("media-title")
         def on_title_change(_name, value):
+            store(_name, value)
+            notify("media-title")
             if value:
-                GLib.idle_add(self.set_title, value)
+                post("media-title", self.set_title, value, priority=COSMETIC)
+                self._post_remember("title", value)
 
         @self.mpv.property_observer("mute")
         def on_mute_change(_name, value):
@@ -1309,7 +1554,7 @@ class CineWindow(Adw.ApplicationWindow):
                 self.mute_toggle_button.set_active(value)
                 self._update_volume_icon(value)
 
-            GLib.idle_add(update)
+            post("mute", update)
 
         @self.mpv.property_observer("sub-visibility")
         @self.mpv.property_observer("sid")
@@ -1325,7 +1570,7 @@ class CineWindow(Adw.ApplicationWindow):
                 except mpv.ShutdownError:
                     pass
 
-            GLib.idle_add(set_icon)
+            post("sub-icon", set_icon, priority=COSMETIC)
 
         @self.mpv.property_observer("aid")
         def on_aid_change(_name, value):
@@ -1338,8 +1583,14 @@ class CineWindow(Adw.ApplicationWindow):
                 except mpv.ShutdownError:
                     pass
 
-            GLib.idle_add(set_icon)
+            post("audio-icon", set_icon, priority=COSMETIC)
 
         @self.mpv.event_callback("shutdown")
         def on_quit(_event):
             GLib.idle_add(self.close)
+
+    def _post_remember(self, key, value):
+        path = self.loaded_path
+        self.dispatch.post(
+            f"remember-{key}", self._remember, path, key, value, priority=COSMETIC
+        )